@@ -33,6 +33,9 @@ Usage:
 ------
     python cad_to_gltf.py -i model.stl -o output.gltf
     python cad_to_gltf.py -i assembly.step -o output.gltf
+    python cad_to_gltf.py -i model.stl -o output.glb --quantize
+    python cad_to_gltf.py -i model.stl -o output.glb --draco
+    python cad_to_gltf.py -i "cad/*.step" -o assets/models/my-project/
     python cad_to_gltf.py --check-step
 
 Author: MESGRO Project
@@ -40,14 +43,24 @@ License: MIT
 """
 
 import argparse
+import base64
+import functools
+import glob
+import json
+import multiprocessing
+import os
+import struct
 import sys
+from collections import Counter
 from pathlib import Path
-from typing import Optional, Tuple
+from types import SimpleNamespace
+from typing import List, Optional, Tuple
 
 # =============================================================================
 # Dependency Check
 # =============================================================================
 
+@functools.lru_cache(maxsize=1)
 def check_step_support() -> Tuple[bool, Optional[str]]:
     """Check if STEP file support is available."""
     try:
@@ -65,6 +78,42 @@ def check_step_support() -> Tuple[bool, Optional[str]]:
     return False, None
 
 
+# OpenCASCADE symbols used by load_step, imported once on first use
+_OCP: Optional[SimpleNamespace] = None
+
+
+def _occ_bindings(library: str) -> SimpleNamespace:
+    """Import the OpenCASCADE classes for the detected binding library."""
+    global _OCP
+    if _OCP is not None:
+        return _OCP
+    
+    if library == "cadquery-ocp":
+        from OCP.STEPControl import STEPControl_Reader
+        from OCP.BRepMesh import BRepMesh_IncrementalMesh
+        from OCP.TopExp import TopExp_Explorer
+        from OCP.TopAbs import TopAbs_FACE
+        from OCP.BRep import BRep_Tool
+        from OCP.TopLoc import TopLoc_Location
+    else:
+        from OCC.Core.STEPControl import STEPControl_Reader
+        from OCC.Core.BRepMesh import BRepMesh_IncrementalMesh
+        from OCC.Core.TopExp import TopExp_Explorer
+        from OCC.Core.TopAbs import TopAbs_FACE
+        from OCC.Core.BRep import BRep_Tool
+        from OCC.Core.TopLoc import TopLoc_Location
+    
+    _OCP = SimpleNamespace(
+        STEPControl_Reader=STEPControl_Reader,
+        BRepMesh_IncrementalMesh=BRepMesh_IncrementalMesh,
+        TopExp_Explorer=TopExp_Explorer,
+        TopAbs_FACE=TopAbs_FACE,
+        BRep_Tool=BRep_Tool,
+        TopLoc_Location=TopLoc_Location,
+    )
+    return _OCP
+
+
 # Check core dependencies
 try:
     import numpy as np
@@ -74,6 +123,12 @@ except ImportError as e:
     print("Install with: pip install trimesh numpy")
     sys.exit(1)
 
+# Optional: faster JSON encoding for GLTF output
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 
 # =============================================================================
 # Supported Formats
@@ -81,6 +136,17 @@ except ImportError as e:
 
 SUPPORTED_FORMATS = {'.stl', '.step', '.stp'}
 
+# Binary STL triangle record: normal, three vertices, attribute byte count
+STL_RECORD_DTYPE = np.dtype([('normal', '<f4', 3), ('v', '<f4', (3, 3)), ('attr', '<u2')])
+
+# GLB container constants (glTF 2.0 binary spec)
+GLB_MAGIC = 0x46546C67       # b'glTF'
+GLB_CHUNK_JSON = 0x4E4F534A  # b'JSON'
+GLB_CHUNK_BIN = 0x004E4942   # b'BIN\0'
+
+# Bytes of BIN chunk encoded per write when embedding base64 (multiple of 3)
+B64_CHUNK_SIZE = 3 * 64 * 1024
+
 
 # =============================================================================
 # Loaders
@@ -89,7 +155,12 @@ SUPPORTED_FORMATS = {'.stl', '.step', '.stp'}
 def load_stl(input_path: Path) -> trimesh.Trimesh:
     """Load an STL file."""
     print(f"  Loading STL: {input_path.name}")
-    mesh = trimesh.load(str(input_path), file_type='stl', force='mesh')
+    mesh = fast_load_binary_stl(input_path)
+    if mesh is not None:
+        return mesh
+    
+    # ASCII STL: optimize_mesh merges and cleans the mesh, so skip trimesh's own pass
+    mesh = trimesh.load(str(input_path), file_type='stl', force='mesh', process=False)
     
     if isinstance(mesh, trimesh.Scene):
         mesh = mesh.dump(concatenate=True)
@@ -97,6 +168,32 @@ def load_stl(input_path: Path) -> trimesh.Trimesh:
     return mesh
 
 
+def fast_load_binary_stl(input_path: Path) -> Optional[trimesh.Trimesh]:
+    """Memory-map a binary STL; returns None if the file is not binary STL."""
+    with open(input_path, 'rb') as f:
+        f.seek(80)
+        header = f.read(4)
+    if len(header) < 4:
+        return None
+    
+    # Binary STL is exactly header + count + 50 bytes per triangle
+    n = struct.unpack('<I', header)[0]
+    if n == 0 or input_path.stat().st_size != 84 + n * STL_RECORD_DTYPE.itemsize:
+        return None
+    
+    data = np.memmap(input_path, dtype=STL_RECORD_DTYPE, mode='r', offset=84, shape=(n,))
+    # Single strided copy straight into trimesh's storage dtype (it keeps
+    # float64/int64); reshaping data['v'] first would copy it once more
+    vertices = np.empty((n, 3, 3), dtype=np.float64)
+    vertices[...] = data['v']
+    vertices = vertices.reshape(-1, 3)
+    del data
+    
+    # Unshared corners; optimize_mesh merges them
+    faces = np.arange(3 * n, dtype=np.int64).reshape(-1, 3)
+    return trimesh.Trimesh(vertices=vertices, faces=faces, process=False)
+
+
 def load_step(input_path: Path) -> trimesh.Trimesh:
     """Load a STEP file using OpenCASCADE (cadquery-ocp)."""
     step_ok, library = check_step_support()
@@ -110,131 +207,222 @@ def load_step(input_path: Path) -> trimesh.Trimesh:
     
     print(f"  Loading STEP via {library}: {input_path.name}")
     
-    # Import based on available library
-    if library == "cadquery-ocp":
-        from OCP.STEPControl import STEPControl_Reader
-        from OCP.BRepMesh import BRepMesh_IncrementalMesh
-        from OCP.TopExp import TopExp_Explorer
-        from OCP.TopAbs import TopAbs_FACE
-        from OCP.BRep import BRep_Tool
-        from OCP.TopLoc import TopLoc_Location
-    else:
-        from OCC.Core.STEPControl import STEPControl_Reader
-        from OCC.Core.BRepMesh import BRepMesh_IncrementalMesh
-        from OCC.Core.TopExp import TopExp_Explorer
-        from OCC.Core.TopAbs import TopAbs_FACE
-        from OCC.Core.BRep import BRep_Tool
-        from OCC.Core.TopLoc import TopLoc_Location
+    occ = _occ_bindings(library)
     
     # Read STEP
-    reader = STEPControl_Reader()
+    reader = occ.STEPControl_Reader()
     if reader.ReadFile(str(input_path)) != 1:
         raise ValueError(f"Failed to read STEP: {input_path}")
     
     reader.TransferRoots()
     shape = reader.OneShape()
     
-    # Tessellate
-    BRepMesh_IncrementalMesh(shape, 0.1)
-    
-    # Extract mesh
-    vertices, faces = [], []
-    offset = 0
+    # Tessellate (faces meshed in parallel where the OCCT build supports it)
+    try:
+        occ.BRepMesh_IncrementalMesh(shape, 0.1, False, 0.5, True)
+    except TypeError:
+        occ.BRepMesh_IncrementalMesh(shape, 0.1)
     
-    explorer = TopExp_Explorer(shape, TopAbs_FACE)
+    # Collect per-face triangulations
+    face_tris = []
+    explorer = occ.TopExp_Explorer(shape, occ.TopAbs_FACE)
     while explorer.More():
-        face = explorer.Current()
-        location = TopLoc_Location()
-        tri = BRep_Tool.Triangulation_s(face, location)
-        
+        location = occ.TopLoc_Location()
+        tri = occ.BRep_Tool.Triangulation_s(explorer.Current(), location)
         if tri:
-            for i in range(1, tri.NbNodes() + 1):
-                node = tri.Node(i)
-                if not location.IsIdentity():
-                    node = node.Transformed(location.Transformation())
-                vertices.append([node.X(), node.Y(), node.Z()])
-            
-            for i in range(1, tri.NbTriangles() + 1):
-                t = tri.Triangle(i)
-                n1, n2, n3 = t.Get()
-                faces.append([n1-1+offset, n2-1+offset, n3-1+offset])
-            
-            offset += tri.NbNodes()
-        
+            face_tris.append((tri, location))
         explorer.Next()
-    
-    return trimesh.Trimesh(vertices=np.array(vertices), faces=np.array(faces))
+
+    if not face_tris:
+        raise ValueError(f"No triangulated faces found in STEP: {input_path}")
+
+    # Size the output once; each face owns a contiguous slice of V and F
+    node_counts = np.array([tri.NbNodes() for tri, _ in face_tris])
+    tri_counts = np.array([tri.NbTriangles() for tri, _ in face_tris])
+    node_offsets = np.cumsum(node_counts) - node_counts
+    tri_offsets = np.cumsum(tri_counts) - tri_counts
+
+    # Allocate in trimesh's storage dtypes so Trimesh() keeps these buffers as-is
+    V = np.empty((int(node_counts.sum()), 3), dtype=np.float64)
+    F = np.empty((int(tri_counts.sum()), 3), dtype=np.int64)
+
+    # Fill each face's slice in turn; the per-node binding calls hold the
+    # GIL, so a thread pool here only interleaves them
+    for (tri, location), v0, f0, nv, nf in zip(face_tris, node_offsets, tri_offsets, node_counts, tri_counts):
+        _extract_face(tri, location, V[v0:v0 + nv], F[f0:f0 + nf], int(v0))
+
+    return trimesh.Trimesh(vertices=V, faces=F)
+
+
+# Whether the OCC binding exposes triangulation arrays via the buffer protocol;
+# None until the first face has been tried
+_BULK_ARRAYS: Optional[bool] = None
+
+
+def _extract_face(tri, location, v_out: np.ndarray, f_out: np.ndarray, offset: int) -> None:
+    """Copy one face triangulation into preallocated slices, shifting indices by offset."""
+    arrays = _bulk_face_arrays(tri, len(v_out), len(f_out)) if _BULK_ARRAYS is not False else None
+    if arrays is not None:
+        nodes, tris = arrays
+        v_out[:] = nodes
+        np.add(tris, offset - 1, out=f_out)  # OCCT node indices are 1-based
+    else:
+        for i in range(1, len(v_out) + 1):
+            node = tri.Node(i)
+            v_out[i-1, 0] = node.X()
+            v_out[i-1, 1] = node.Y()
+            v_out[i-1, 2] = node.Z()
+
+        for i in range(1, len(f_out) + 1):
+            f_out[i-1] = tri.Triangle(i).Get()
+        f_out += offset - 1  # OCCT node indices are 1-based
+
+    # Apply the face location once as a single affine transform
+    if not location.IsIdentity():
+        trsf = location.Transformation()
+        R = np.array([[trsf.Value(r, c) for c in range(1, 4)] for r in range(1, 4)])
+        t = np.array([trsf.Value(r, 4) for r in range(1, 4)])
+        v_out[:] = v_out @ R.T + t
+
+
+def _bulk_face_arrays(tri, n_nodes: int, n_tris: int) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+    """View nodes/triangles straight from OCCT's internal arrays, if the binding allows it."""
+    global _BULK_ARRAYS
+    try:
+        nodes = memoryview(tri.InternalNodes())
+        tris = memoryview(tri.InternalTriangles())
+    except (AttributeError, TypeError):
+        _BULK_ARRAYS = False
+        return None
+
+    # Expect packed gp_Pnt (3 x float64) and Poly_Triangle (3 x int32) records
+    if nodes.nbytes != n_nodes * 24 or tris.nbytes != n_tris * 12:
+        _BULK_ARRAYS = False
+        return None
+
+    _BULK_ARRAYS = True
+    return (np.frombuffer(nodes, dtype=np.float64).reshape(-1, 3),
+            np.frombuffer(tris, dtype=np.int32).reshape(-1, 3))
 
 
 # =============================================================================
 # Processing & Export
 # =============================================================================
 
+def fast_merge_vertices(mesh: trimesh.Trimesh) -> trimesh.Trimesh:
+    """Merge bit-identical vertices with one lexsort over the xyz columns."""
+    vertices = mesh.vertices
+    if len(vertices) == 0:
+        return mesh
+    # Sort rows by x, then y, then z; equal rows end up adjacent
+    order = np.lexsort(vertices.T[::-1])
+    ordered = vertices[order]
+    first = np.empty(len(ordered), dtype=bool)
+    first[0] = True
+    np.any(ordered[1:] != ordered[:-1], axis=1, out=first[1:])
+    inverse = np.empty(len(ordered), dtype=np.int64)
+    inverse[order] = np.cumsum(first) - 1
+    faces = inverse[mesh.faces]
+    mesh.vertices = ordered[first]
+    mesh.faces = faces
+    return mesh
+
+
+def fast_drop_degenerate(mesh: trimesh.Trimesh, eps: float = 1e-12) -> trimesh.Trimesh:
+    """Drop zero-area faces using a vectorized cross-product mask."""
+    v = mesh.vertices[mesh.faces]
+    cross = np.cross(v[:, 1] - v[:, 0], v[:, 2] - v[:, 0])
+    keep = (cross * cross).sum(axis=1) > eps * eps
+    mesh.faces = mesh.faces[keep]
+    return mesh
+
+
+def fast_drop_duplicate_faces(mesh: trimesh.Trimesh) -> trimesh.Trimesh:
+    """Drop faces that reference the same vertex set, keeping first occurrences."""
+    sf = np.sort(mesh.faces, axis=1)
+    n = len(mesh.vertices)
+    if n ** 3 < 2 ** 63:
+        # Pack each sorted triple into one int64 so unique sorts scalars, not rows
+        _, first = np.unique((sf[:, 0] * n + sf[:, 1]) * n + sf[:, 2], return_index=True)
+    else:
+        _, first = np.unique(sf, axis=0, return_index=True)
+    mesh.faces = mesh.faces[np.sort(first)]
+    return mesh
+
+
+def _winding_ok(mesh: trimesh.Trimesh) -> bool:
+    """Winding is consistent iff no directed edge is shared by two faces."""
+    if len(mesh.faces) == 0:
+        return True
+    edges = mesh.faces[:, [0, 1, 1, 2, 2, 0]].reshape(-1, 2)
+    # One int64 key per directed edge; a repeat shows up next to its twin after sorting
+    keys = np.sort(edges[:, 0] * len(mesh.vertices) + edges[:, 1])
+    return not (keys[1:] == keys[:-1]).any()
+
+
+def reorder_for_vertex_cache(mesh: trimesh.Trimesh) -> trimesh.Trimesh:
+    """Reorder faces and vertices for GPU vertex cache/fetch locality (optional: meshoptimizer)."""
+    try:
+        import meshoptimizer
+    except ImportError:
+        return mesh
+    
+    vertices = np.ascontiguousarray(mesh.vertices)
+    indices = mesh.faces.astype(np.uint32).ravel()
+    
+    optimized = np.empty_like(indices)
+    meshoptimizer.optimize_vertex_cache(optimized, indices, len(indices), len(vertices))
+    
+    # Rewrites `optimized` in place to point at the reordered vertices
+    remapped = np.empty_like(vertices)
+    unique = meshoptimizer.optimize_vertex_fetch(remapped, optimized, vertices, len(optimized), len(vertices))
+    
+    mesh.vertices = remapped[:unique]
+    mesh.faces = optimized.reshape(-1, 3)
+    return mesh
+
+
 def optimize_mesh(mesh: trimesh.Trimesh) -> trimesh.Trimesh:
     """Optimize mesh for web viewing."""
     print("  Optimizing...")
-    mesh.merge_vertices()
-    # Use update_faces with a mask to remove degenerate/duplicate faces
-    if hasattr(mesh, 'remove_degenerate_faces'):
-        mesh.remove_degenerate_faces()
-    if hasattr(mesh, 'remove_duplicate_faces'):
-        mesh.remove_duplicate_faces()
-    # Fix normals if needed
-    try:
-        if not mesh.is_winding_consistent:
-            mesh.fix_normals()
-    except Exception:
-        pass  # Some meshes may not support this check
+    fast_merge_vertices(mesh)
+    fast_drop_degenerate(mesh)
+    fast_drop_duplicate_faces(mesh)
+    # Fix winding only when the cheap edge check finds a problem
+    if not _winding_ok(mesh):
+        try:
+            trimesh.repair.fix_winding(mesh)
+        except Exception:
+            pass  # Needs networkx; some meshes may not support this repair
+    reorder_for_vertex_cache(mesh)
     print(f"  Result: {len(mesh.vertices):,} vertices, {len(mesh.faces):,} faces")
     return mesh
 
 
-def export_gltf(mesh: trimesh.Trimesh, output_path: Path) -> None:
+def export_gltf(mesh: trimesh.Trimesh, output_path: Path, quantize: bool = False,
+                draco: bool = False) -> None:
     """Export to GLTF with embedded binary."""
     print(f"  Exporting: {output_path.name}")
     output_path.parent.mkdir(parents=True, exist_ok=True)
     
-    scene = trimesh.Scene(mesh)
+    # Serialize once as GLB; .gltf output is derived from its chunks
+    if draco:
+        glb_data = build_draco_glb(mesh)
+    elif quantize:
+        glb_data = build_quantized_glb(mesh)
+    else:
+        glb_data = trimesh.Scene(mesh).export(file_type='glb')
     
-    # Try GLB format first (binary GLTF) - more reliable
-    try:
-        glb_data = scene.export(file_type='glb')
-        # Save as .glb if output ends with .glb, otherwise convert
-        if output_path.suffix.lower() == '.glb':
+    if output_path.suffix.lower() == '.gltf':
+        try:
+            gltf_dict, bin_chunk = _read_glb(glb_data)
+            _write_gltf(output_path, gltf_dict, bin_chunk)
+        except ValueError:
+            # Fallback: save as GLB with .gltf extension (still works in viewers)
+            print(f"  Note: Saving as binary GLTF (GLB format)")
             with open(output_path, 'wb') as f:
                 f.write(glb_data)
-        else:
-            # For .gltf, we need to embed the binary as base64
-            import json
-            import base64
-            
-            # Export as dict and handle binary buffer
-            gltf_dict = scene.export(file_type='gltf', embed_buffers=True)
-            
-            if isinstance(gltf_dict, dict):
-                # Convert any bytes in buffers to base64 data URIs
-                if 'buffers' in gltf_dict:
-                    for buffer in gltf_dict['buffers']:
-                        if 'uri' not in buffer and 'extras' in buffer:
-                            # Buffer data might be in extras
-                            pass
-                        elif isinstance(buffer.get('uri'), bytes):
-                            b64 = base64.b64encode(buffer['uri']).decode('ascii')
-                            buffer['uri'] = f"data:application/octet-stream;base64,{b64}"
-                
-                with open(output_path, 'w') as f:
-                    json.dump(gltf_dict, f)
-            else:
-                # Fallback: just write whatever we got
-                with open(output_path, 'wb') as f:
-                    if isinstance(gltf_dict, bytes):
-                        f.write(gltf_dict)
-                    else:
-                        f.write(str(gltf_dict).encode('utf-8'))
-    except Exception as e:
-        # Ultimate fallback: save as GLB with .gltf extension (still works in viewers)
-        print(f"  Note: Saving as binary GLTF (GLB format)")
-        glb_data = scene.export(file_type='glb')
+    else:
         with open(output_path, 'wb') as f:
             f.write(glb_data)
     
@@ -242,11 +430,198 @@ def export_gltf(mesh: trimesh.Trimesh, output_path: Path) -> None:
     print(f"  Size: {size/1024/1024:.2f} MB" if size > 1024*1024 else f"  Size: {size/1024:.2f} KB")
 
 
+def build_quantized_glb(mesh: trimesh.Trimesh) -> bytes:
+    """Build a GLB with int16 positions using KHR_mesh_quantization."""
+    vertices = np.asarray(mesh.vertices, dtype=np.float64)
+    bbox_min, bbox_max = vertices.min(axis=0), vertices.max(axis=0)
+    
+    # Normalized SHORT covers [-1, 1]; the node transform maps it back to model space.
+    # A uniform scale keeps the dequantized mesh undistorted.
+    center = (bbox_min + bbox_max) / 2
+    half_extent = float((bbox_max - bbox_min).max()) / 2 or 1.0
+    quantized = np.round((vertices - center) / half_extent * 32767).astype(np.int16)
+    
+    # Pad each position to 4 components so the vertex stride is 4-byte aligned
+    positions = np.zeros((len(quantized), 4), dtype=np.int16)
+    positions[:, :3] = quantized
+    # 16-bit indices whenever they fit (0xFFFF is reserved for primitive restart)
+    index_dtype, index_type = (np.uint16, 5123) if len(vertices) < 0xFFFF else (np.uint32, 5125)
+    indices = np.ascontiguousarray(mesh.faces, dtype=index_dtype).ravel()
+    
+    position_bytes = positions.tobytes()
+    index_bytes = indices.tobytes()
+    
+    gltf_dict = {
+        'asset': {'version': '2.0', 'generator': 'MESGRO cad_to_gltf.py'},
+        'extensionsUsed': ['KHR_mesh_quantization'],
+        'extensionsRequired': ['KHR_mesh_quantization'],
+        'scene': 0,
+        'scenes': [{'nodes': [0]}],
+        'nodes': [{
+            'mesh': 0,
+            'translation': center.tolist(),
+            'scale': [half_extent] * 3,
+        }],
+        'meshes': [{'primitives': [{'attributes': {'POSITION': 0}, 'indices': 1, 'mode': 4}]}],
+        'accessors': [
+            {
+                'bufferView': 0,
+                'componentType': 5122,  # SHORT
+                'normalized': True,
+                'type': 'VEC3',
+                'count': len(quantized),
+                'min': quantized.min(axis=0).tolist(),
+                'max': quantized.max(axis=0).tolist(),
+            },
+            {
+                'bufferView': 1,
+                'componentType': index_type,
+                'type': 'SCALAR',
+                'count': len(indices),
+            },
+        ],
+        'bufferViews': [
+            {'buffer': 0, 'byteOffset': 0, 'byteLength': len(position_bytes),
+             'byteStride': 8, 'target': 34962},
+            {'buffer': 0, 'byteOffset': len(position_bytes), 'byteLength': len(index_bytes),
+             'target': 34963},
+        ],
+        'buffers': [{'byteLength': len(position_bytes) + len(index_bytes)}],
+    }
+    
+    return _pack_glb(gltf_dict, position_bytes + index_bytes)
+
+
+def build_draco_glb(mesh: trimesh.Trimesh) -> bytes:
+    """Build a GLB whose geometry is Draco-compressed (KHR_draco_mesh_compression)."""
+    try:
+        import DracoPy
+    except ImportError:
+        raise ImportError(
+            "Draco compression requires DracoPy.\n"
+            "Install with: pip install DracoPy"
+        )
+    
+    encoded = DracoPy.encode(
+        np.asarray(mesh.vertices, dtype=np.float32),
+        np.asarray(mesh.faces, dtype=np.uint32),
+        quantization_bits=14,
+        compression_level=7,
+    )
+    # Draco may reorder/merge vertices; accessors must describe the decoded mesh
+    decoded = DracoPy.decode(encoded)
+    points = np.asarray(decoded.points, dtype=np.float32)
+    n_indices = int(np.asarray(decoded.faces).size)
+    
+    gltf_dict = {
+        'asset': {'version': '2.0', 'generator': 'MESGRO cad_to_gltf.py'},
+        'extensionsUsed': ['KHR_draco_mesh_compression'],
+        'extensionsRequired': ['KHR_draco_mesh_compression'],
+        'scene': 0,
+        'scenes': [{'nodes': [0]}],
+        'nodes': [{'mesh': 0}],
+        'meshes': [{'primitives': [{
+            'attributes': {'POSITION': 0},
+            'indices': 1,
+            'mode': 4,
+            'extensions': {'KHR_draco_mesh_compression': {
+                'bufferView': 0,
+                'attributes': {'POSITION': 0},  # Draco attribute id of positions
+            }},
+        }]}],
+        'accessors': [
+            {
+                'componentType': 5126,  # FLOAT
+                'type': 'VEC3',
+                'count': len(points),
+                'min': points.min(axis=0).tolist(),
+                'max': points.max(axis=0).tolist(),
+            },
+            {
+                'componentType': 5125,  # UNSIGNED_INT
+                'type': 'SCALAR',
+                'count': n_indices,
+            },
+        ],
+        'bufferViews': [{'buffer': 0, 'byteOffset': 0, 'byteLength': len(encoded)}],
+        'buffers': [{'byteLength': len(encoded)}],
+    }
+    
+    return _pack_glb(gltf_dict, encoded)
+
+
+def _pack_glb(gltf_dict: dict, bin_data: bytes) -> bytes:
+    """Pack a GLTF dict and its binary buffer into a GLB container."""
+    json_bytes = _json_bytes(gltf_dict)
+    json_bytes += b' ' * (-len(json_bytes) % 4)
+    bin_data += b'\0' * (-len(bin_data) % 4)
+    
+    length = 12 + 8 + len(json_bytes) + 8 + len(bin_data)
+    return b''.join([
+        struct.pack('<III', GLB_MAGIC, 2, length),
+        struct.pack('<II', len(json_bytes), GLB_CHUNK_JSON), json_bytes,
+        struct.pack('<II', len(bin_data), GLB_CHUNK_BIN), bin_data,
+    ])
+
+
+def _read_glb(glb_data: bytes) -> Tuple[dict, Optional[memoryview]]:
+    """Split a GLB container into its parsed JSON chunk and raw BIN chunk."""
+    magic, _version, length = struct.unpack_from('<III', glb_data, 0)
+    if magic != GLB_MAGIC or length > len(glb_data):
+        raise ValueError("Not a valid GLB container")
+    
+    data = memoryview(glb_data)
+    gltf_dict, bin_chunk = None, None
+    pos = 12
+    while pos + 8 <= length:
+        chunk_len, chunk_type = struct.unpack_from('<II', glb_data, pos)
+        chunk = data[pos + 8:pos + 8 + chunk_len]
+        if chunk_type == GLB_CHUNK_JSON:
+            gltf_dict = json.loads(bytes(chunk))
+        elif chunk_type == GLB_CHUNK_BIN:
+            bin_chunk = chunk
+        pos += 8 + chunk_len
+    
+    if gltf_dict is None:
+        raise ValueError("GLB container has no JSON chunk")
+    
+    return gltf_dict, bin_chunk
+
+
+def _write_gltf(output_path: Path, gltf_dict: dict, bin_chunk: Optional[memoryview]) -> None:
+    """Write GLTF JSON, streaming the BIN chunk into buffers[0] as a base64 data URI."""
+    if bin_chunk is None or not gltf_dict.get('buffers'):
+        with open(output_path, 'wb') as f:
+            f.write(_json_bytes(gltf_dict))
+        return
+    
+    # Serialize around a placeholder so the base64 text never exists as one string
+    sentinel = "@@GLB_BIN_CHUNK@@"
+    gltf_dict['buffers'][0]['uri'] = sentinel
+    head, tail = _json_bytes(gltf_dict).split(f'"{sentinel}"'.encode('ascii'))
+    
+    with open(output_path, 'wb') as f:
+        f.write(head)
+        f.write(b'"data:application/octet-stream;base64,')
+        # Chunk size is a multiple of 3 so no padding appears mid-stream
+        for i in range(0, len(bin_chunk), B64_CHUNK_SIZE):
+            f.write(base64.b64encode(bin_chunk[i:i + B64_CHUNK_SIZE]))
+        f.write(b'"')
+        f.write(tail)
+
+
+def _json_bytes(obj) -> bytes:
+    """Serialize compact UTF-8 JSON, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(obj, separators=(',', ':')).encode('utf-8')
+
 # =============================================================================
 # Main
 # =============================================================================
 
-def convert(input_file: str, output_file: str) -> bool:
+def convert(input_file: str, output_file: str, quantize: bool = False,
+            draco: bool = False) -> bool:
     """Convert CAD to GLTF."""
     input_path = Path(input_file).resolve()
     output_path = Path(output_file).resolve()
@@ -274,7 +649,7 @@ def convert(input_file: str, output_file: str) -> bool:
     try:
         mesh = load_stl(input_path) if ext == '.stl' else load_step(input_path)
         mesh = optimize_mesh(mesh)
-        export_gltf(mesh, output_path)
+        export_gltf(mesh, output_path, quantize=quantize, draco=draco)
         print(f"\n✓ Success!\n")
         return True
     except ImportError as e:
@@ -285,13 +660,58 @@ def convert(input_file: str, output_file: str) -> bool:
         return False
 
 
+def expand_inputs(pattern: str) -> List[Path]:
+    """Expand a directory or glob pattern into supported CAD files."""
+    path = Path(pattern)
+    if path.is_file():
+        return []  # An existing file is never a pattern, even if named like one
+    if path.is_dir():
+        candidates = path.iterdir()
+    elif any(c in pattern for c in '*?['):
+        candidates = map(Path, glob.glob(pattern))
+    else:
+        return []
+    return sorted(p for p in candidates if p.is_file() and p.suffix.lower() in SUPPORTED_FORMATS)
+
+
+def _convert_job(job: Tuple[str, str, bool, bool]) -> Tuple[str, bool]:
+    """Pool worker: run one conversion and report (input, success)."""
+    input_file, output_file, quantize, draco = job
+    return input_file, convert(input_file, output_file, quantize=quantize, draco=draco)
+
+
+def convert_batch(inputs: List[Path], output_dir: str, quantize: bool = False,
+                  draco: bool = False) -> bool:
+    """Convert several files concurrently, writing <output_dir>/<stem>.gltf for each."""
+    out_dir = Path(output_dir)
+    jobs = [(str(p), str(out_dir / f"{p.stem}.gltf"), quantize, draco) for p in inputs]
+    
+    failed = []
+    with multiprocessing.Pool(min(os.cpu_count() or 1, len(jobs))) as pool:
+        for input_file, ok in pool.imap_unordered(_convert_job, jobs):
+            if not ok:
+                failed.append(input_file)
+    
+    print(f"Converted {len(jobs) - len(failed)}/{len(jobs)} files")
+    for input_file in failed:
+        print(f"  ✗ {input_file}")
+    return not failed
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Convert STL/STEP to GLTF for web 3D viewing.",
         epilog="Supported: .stl, .step, .stp | NOT supported: .sldprt, .f3d (export first)"
     )
-    parser.add_argument('-i', '--input_file', help="Input file (.stl/.step/.stp)")
-    parser.add_argument('-o', '--output_file', help="Output GLTF file")
+    parser.add_argument('-i', '--input_file',
+                        help="Input file (.stl/.step/.stp), or a directory/glob for batch mode")
+    parser.add_argument('-o', '--output_file',
+                        help="Output GLTF file (output directory in batch mode)")
+    compression = parser.add_mutually_exclusive_group()
+    compression.add_argument('--quantize', action='store_true',
+                             help="Store positions as int16 (KHR_mesh_quantization, ~2x smaller)")
+    compression.add_argument('--draco', action='store_true',
+                             help="Draco-compress geometry (KHR_draco_mesh_compression, needs DracoPy)")
     parser.add_argument('--check-step', action='store_true', help="Check STEP support")
     
     args = parser.parse_args()
@@ -304,7 +724,22 @@ def main():
     if not args.input_file or not args.output_file:
         parser.error("Both -i and -o are required")
     
-    sys.exit(0 if convert(args.input_file, args.output_file) else 1)
+    batch_inputs = expand_inputs(args.input_file)
+    if batch_inputs:
+        # Outputs are named <stem>.gltf, so e.g. part.stl and part.step would
+        # race on one file; casefold since common filesystems ignore case
+        stems = Counter(p.stem.casefold() for p in batch_inputs)
+        clashes = [p.name for p in batch_inputs if stems[p.stem.casefold()] > 1]
+        if clashes:
+            parser.error(f"Inputs would write the same output file: {', '.join(clashes)}")
+        sys.exit(0 if convert_batch(batch_inputs, args.output_file,
+                                    quantize=args.quantize, draco=args.draco) else 1)
+    input_path = Path(args.input_file)
+    if not input_path.is_file() and (input_path.is_dir() or any(c in args.input_file for c in '*?[')):
+        parser.error(f"No .stl/.step/.stp files match: {args.input_file}")
+    
+    sys.exit(0 if convert(args.input_file, args.output_file,
+                              quantize=args.quantize, draco=args.draco) else 1)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Numeric kernels for spice_to_svg.py wire routing
+
+Only used for large netlists. When Numba is installed the kernels are
+JIT-compiled to native code; without it they still run as plain Python,
+but spice_to_svg.py keeps its own pure-Python path instead.
+"""
+
+import numpy as np
+
+try:
+    from numba import njit
+    HAVE_NUMBA = True
+except ImportError:
+    HAVE_NUMBA = False
+
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit"""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda fn: fn
+
+
+# Nets up to this many ports are insertion-sorted in place; np.sort's
+# per-call allocation dominates for the 3-8 port nets most netlists have
+_SMALL_NET = 32
+
+
+@njit(cache=True)
+def _upper_median(a, start, end):
+    """Insertion-sort a[start:end] in place and return its upper median."""
+    for i in range(start + 1, end):
+        v = a[i]
+        j = i - 1
+        while j >= start and a[j] > v:
+            a[j + 1] = a[j]
+            j -= 1
+        a[j + 1] = v
+    return a[start + (end - start) // 2]
+
+
+@njit(cache=True)
+def bus_points(xs, ys, offsets):
+    """Per-axis median (upper median for even counts) of each node's ports.
+
+    xs/ys hold the port coordinates of all nodes back to back; the ports of
+    node i are xs[offsets[i]:offsets[i + 1]]. Neither array is modified.
+    """
+    n = len(offsets) - 1
+    sx = xs.copy()
+    sy = ys.copy()
+    bx = np.empty(n, dtype=np.int64)
+    by = np.empty(n, dtype=np.int64)
+    for i in range(n):
+        start = offsets[i]
+        end = offsets[i + 1]
+        if end - start <= _SMALL_NET:
+            bx[i] = _upper_median(sx, start, end)
+            by[i] = _upper_median(sy, start, end)
+        else:
+            # Selection instead of a full sort for wide nets
+            mid = (end - start) // 2
+            bx[i] = np.partition(xs[start:end], mid)[mid]
+            by[i] = np.partition(ys[start:end], mid)[mid]
+    return bx, by
@@ -12,7 +12,10 @@ Features:
 - Support for R, C, L, D, Q, M, V, I components
 
 Usage:
-    python spice_to_svg.py <spice_file> [output_file.svg]
+    python spice_to_svg.py <spice_file> [output_file.svg] [--sort-components]
+
+Components are laid out in netlist order; --sort-components lays them out
+alphabetically by name instead.
 
 Example:
     python spice_to_svg.py circuit.cir
@@ -20,33 +23,98 @@ Example:
 """
 
 import re
+import os
 import sys
-import math
-from typing import Dict, List, Tuple, Set, Optional
+import mmap
+import functools
+from typing import Dict, Iterable, Iterator, List, Tuple, Set, Optional
 from dataclasses import dataclass, field
-import xml.etree.ElementTree as ET
-from xml.dom import minidom
-from collections import defaultdict
+from itertools import chain
+from collections import Counter, defaultdict
+
+# Optional: NumPy medians for very wide nodes. Imported on first use; it
+# costs more than the rest of this script's import.
+@functools.lru_cache(maxsize=1)
+def _numpy():
+    """The numpy module, or None if it is not installed"""
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
 
+# Optional: JIT-compiled routing math for large netlists (needs numpy + numba).
+# Imported on first use, since loading numba takes hundreds of ms.
+@functools.lru_cache(maxsize=1)
+def _routing_kernels():
+    """The routing_kernels module, or None if numpy or numba is missing"""
+    try:
+        import routing_kernels
+    except ImportError:
+        return None
+    return routing_kernels if routing_kernels.HAVE_NUMBA else None
 
-@dataclass
+
+@dataclass(slots=True)
 class Component:
     """Represents an electronic component"""
     name: str           # e.g., R1, C1, Q1
     type: str           # e.g., 'R', 'C', 'L', 'Q', 'D'
     value: str          # e.g., '10k', '100uF'
-    nodes: List[str]    # Connection nodes
+    nodes: Tuple[str, ...]  # Connection nodes (interned names)
     x: int = 0          # X position
     y: int = 0          # Y position
     rotation: int = 0   # Rotation in degrees (0, 90, 180, 270)
-    ports: Dict[int, Tuple[int, int]] = field(default_factory=dict)  # Pin positions
+    ports: Tuple[Tuple[int, int], ...] = ()  # Pin positions, indexed like nodes (shared per type)
 
 
-@dataclass
+@dataclass(slots=True)
 class Connection:
     """Represents a connection between components"""
     node: str
     components: List[Tuple[str, int]]  # (component_name, pin_index)
+    is_ground: bool = False             # Node name is one of GROUND_NODES
+
+
+@dataclass(slots=True)
+class NodePorts:
+    """Absolute port positions registered on one node, as parallel lists"""
+    xs: List[int] = field(default_factory=list)
+    ys: List[int] = field(default_factory=list)
+    comp_names: List[str] = field(default_factory=list)
+    pins: List[int] = field(default_factory=list)
+
+
+def _logical_lines(src: Iterable[str]) -> Iterator[str]:
+    """Yield netlist lines with '+' continuation lines joined onto their parent"""
+    buf: List[str] = []
+    for raw in src:
+        line = raw.rstrip()
+        if line.startswith('+'):
+            buf.append(line[1:].strip())
+        else:
+            if buf:
+                yield ' '.join(buf)
+            buf = [line]
+    if buf:
+        yield ' '.join(buf)
+
+
+# Node names (upper-cased) treated as ground; these get no node label
+GROUND_NODES = frozenset({'0', 'GND', 'VSS', 'GROUND'})
+
+
+# XML escaping is done locally: xml.sax.saxutils imports urllib.request,
+# which made up most of this script's import time
+def _escape(data: str) -> str:
+    """Escape &, < and > in SVG text content"""
+    return data.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
+
+
+def _escape_attr(data: str) -> str:
+    """Escape text placed inside a double-quoted attribute"""
+    return _escape(data).replace('"', '&quot;')
 
 
 class SPICEParser:
@@ -65,6 +133,17 @@ class SPICEParser:
         'X': 'Subcircuit',
         'U': 'IC/Chip',
     }
+    _TYPE_SET: frozenset = frozenset(COMPONENT_TYPES)
+    
+    # One pass classifies a logical line: comment | .title | other directive | component
+    _LINE_RE = re.compile(r'^\s*(?:(\*)|\.title\b\s*(.*)|(\.\S*.*)|([RCLDQMJVIXU])(\S*)\s+(.*))', re.I)
+    _OHM_RE = re.compile(r'OHMS?')
+    
+    # Netlists at least this large are scanned from a memory map instead of line by line
+    _MMAP_MIN_BYTES = 64 * 1024
+    # Byte-level logical-line scan: comment blocks (with their '+' continuations)
+    # match the first branch without a capture, so they are never decoded
+    _BLOCK_RE = re.compile(rb'^[ \t]*\*[^\n]*(?:\n\+[^\n]*)*|^([^\n]*(?:\n\+[^\n]*)*)', re.M)
     
     def __init__(self, filepath: str = None, content: str = None):
         self.filepath = filepath
@@ -77,134 +156,149 @@ class SPICEParser:
         """Parse SPICE netlist file or content"""
         if self.filepath:
             try:
-                with open(self.filepath, 'r', encoding='utf-8') as f:
-                    lines = f.readlines()
+                try:
+                    self._parse_file('utf-8')
+                except UnicodeDecodeError:
+                    # Not UTF-8: discard the partial parse and start over as latin-1
+                    self.components = {}
+                    self.title = "Circuit Schematic"
+                    self._parse_file('latin-1')
             except FileNotFoundError:
                 print(f"Error: File '{self.filepath}' not found")
                 sys.exit(1)
-            except UnicodeDecodeError:
-                with open(self.filepath, 'r', encoding='latin-1') as f:
-                    lines = f.readlines()
         elif self.content:
-            lines = self.content.split('\n')
+            self._parse_lines(_logical_lines(self.content.splitlines()))
         else:
             print("Error: No input provided")
             sys.exit(1)
         
-        # Join continuation lines (lines starting with +)
-        joined_lines = []
-        current_line = ""
-        for line in lines:
-            line = line.rstrip()
-            if line.startswith('+'):
-                current_line += ' ' + line[1:].strip()
-            else:
-                if current_line:
-                    joined_lines.append(current_line)
-                current_line = line
-        if current_line:
-            joined_lines.append(current_line)
+        # Build connection map
+        self._build_connections()
         
-        for line in joined_lines:
-            line = line.strip()
+        return self.components, self.connections
+    
+    def _parse_file(self, encoding: str):
+        """Stream self.filepath through the line parser in the given encoding"""
+        if os.path.getsize(self.filepath) >= self._MMAP_MIN_BYTES:
+            self._parse_lines(self._mapped_lines(self.filepath, encoding))
+        else:
+            with open(self.filepath, 'r', encoding=encoding) as f:
+                self._parse_lines(_logical_lines(f))
+    
+    def _mapped_lines(self, path: str, encoding: str = 'utf-8') -> Iterator[str]:
+        """Yield logical lines of a large netlist, decoding only non-comment blocks"""
+        with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            for m in self._BLOCK_RE.finditer(mm):
+                block = m.group(1)
+                if block:
+                    yield from _logical_lines(block.decode(encoding).split('\n'))
+    
+    def _parse_lines(self, lines: Iterable[str]):
+        """Parse logical (continuation-joined) netlist lines"""
+        line_re = self._LINE_RE
+        type_set = SPICEParser._TYPE_SET
+        for line in lines:
+            m = line_re.match(line)
             
-            # Skip comments and empty lines
-            if not line or line.startswith('*'):
+            if m is None:
+                # Skip empty lines; the first non-component line is often the title
+                line = line.strip()
+                if line and not self.components and line[0].upper() not in type_set:
+                    self.title = line
                 continue
             
-            # Parse directives
-            if line.startswith('.'):
-                if line.upper().startswith('.TITLE'):
-                    self.title = line.split(maxsplit=1)[1] if len(line.split(maxsplit=1)) > 1 else "Circuit"
+            # Skip comments
+            if m.group(1):
                 continue
             
-            # First line is often the title
-            if not self.components and not line.startswith('.'):
-                first_char = line[0].upper() if line else ''
-                if first_char not in self.COMPONENT_TYPES:
-                    self.title = line
-                    continue
+            # Parse directives
+            if m.group(2) is not None:
+                self.title = m.group(2).strip() or "Circuit"
+                continue
+            if m.group(3):
+                continue
             
             # Parse component lines
-            self._parse_component_line(line)
-        
-        # Build connection map
-        self._build_connections()
-        
-        return self.components, self.connections
+            self._parse_component_line(m.group(4) + m.group(5), m.group(6).split())
     
-    def _parse_component_line(self, line: str):
+    def _parse_component_line(self, comp_name: str, args: List[str]):
         """Parse a single component line with improved value extraction"""
-        parts = line.split()
-        if not parts:
-            return
-        
-        comp_name = parts[0]
-        comp_type = comp_name[0].upper()
-        
-        if comp_type not in self.COMPONENT_TYPES:
-            return
+        # Names key self.components and are repeated in every connection entry
+        comp_name = sys.intern(comp_name)
+        parts = [comp_name] + args
         
         if len(parts) < 3:
             return
         
         # Parse based on component type
-        if comp_type in ['R', 'C', 'L']:
-            # Format: R1 node1 node2 value [model] [params]
-            nodes = [parts[1], parts[2]]
-            value = self._extract_value(parts[3:])
+        comp_type = comp_name[0].upper()
+        handler = self._HANDLERS.get(comp_type)
+        if handler:
+            handler(self, comp_name, comp_type, parts)
+    
+    def _parse_rcl(self, comp_name: str, comp_type: str, parts: List[str]):
+        # Format: R1 node1 node2 value [model] [params]
+        nodes = (sys.intern(parts[1]), sys.intern(parts[2]))
+        value = self._extract_value(parts[3:])
+        self.components[comp_name] = Component(comp_name, comp_type, value, nodes)
+    
+    def _parse_diode(self, comp_name: str, comp_type: str, parts: List[str]):
+        # Format: D1 anode cathode model [params]
+        nodes = (sys.intern(parts[1]), sys.intern(parts[2]))
+        value = parts[3] if len(parts) > 3 else "D"
+        self.components[comp_name] = Component(comp_name, comp_type, value, nodes)
+    
+    def _parse_bjt(self, comp_name: str, comp_type: str, parts: List[str]):
+        # Format: Q1 collector base emitter [substrate] model
+        if len(parts) >= 5:
+            nodes = tuple(map(sys.intern, parts[1:4]))  # C, B, E
+            value = parts[4] if len(parts) > 4 else "NPN"
             self.components[comp_name] = Component(comp_name, comp_type, value, nodes)
-        
-        elif comp_type == 'D':
-            # Format: D1 anode cathode model [params]
-            nodes = [parts[1], parts[2]]
-            value = parts[3] if len(parts) > 3 else "D"
+    
+    def _parse_mosfet(self, comp_name: str, comp_type: str, parts: List[str]):
+        # Format: M1 drain gate source bulk model [params]
+        if len(parts) >= 6:
+            nodes = tuple(map(sys.intern, parts[1:5]))  # D, G, S, B
+            value = parts[5] if len(parts) > 5 else "NMOS"
             self.components[comp_name] = Component(comp_name, comp_type, value, nodes)
-        
-        elif comp_type == 'Q':
-            # Format: Q1 collector base emitter [substrate] model
-            if len(parts) >= 5:
-                nodes = [parts[1], parts[2], parts[3]]  # C, B, E
-                value = parts[4] if len(parts) > 4 else "NPN"
-                self.components[comp_name] = Component(comp_name, comp_type, value, nodes)
-        
-        elif comp_type == 'M':
-            # Format: M1 drain gate source bulk model [params]
-            if len(parts) >= 6:
-                nodes = [parts[1], parts[2], parts[3], parts[4]]  # D, G, S, B
-                value = parts[5] if len(parts) > 5 else "NMOS"
-                self.components[comp_name] = Component(comp_name, comp_type, value, nodes)
-        
-        elif comp_type == 'J':
-            # Format: J1 drain gate source model
-            if len(parts) >= 5:
-                nodes = [parts[1], parts[2], parts[3]]  # D, G, S
-                value = parts[4] if len(parts) > 4 else "JFET"
-                self.components[comp_name] = Component(comp_name, comp_type, value, nodes)
-        
-        elif comp_type in ['V', 'I']:
-            # Format: V1 n+ n- [DC value] [AC mag [phase]] [transient]
-            nodes = [parts[1], parts[2]]
-            value = self._extract_source_value(parts[3:])
+    
+    def _parse_jfet(self, comp_name: str, comp_type: str, parts: List[str]):
+        # Format: J1 drain gate source model
+        if len(parts) >= 5:
+            nodes = tuple(map(sys.intern, parts[1:4]))  # D, G, S
+            value = parts[4] if len(parts) > 4 else "JFET"
             self.components[comp_name] = Component(comp_name, comp_type, value, nodes)
-        
-        elif comp_type in ['X', 'U']:
-            # Subcircuit/IC - variable number of nodes
-            # Last part is the subcircuit name
-            if len(parts) >= 3:
-                nodes = parts[1:-1]
-                value = parts[-1]
-                self.components[comp_name] = Component(comp_name, comp_type, value, nodes)
+    
+    def _parse_source(self, comp_name: str, comp_type: str, parts: List[str]):
+        # Format: V1 n+ n- [DC value] [AC mag [phase]] [transient]
+        nodes = (sys.intern(parts[1]), sys.intern(parts[2]))
+        value = self._extract_source_value(parts[3:])
+        self.components[comp_name] = Component(comp_name, comp_type, value, nodes)
+    
+    def _parse_subcircuit(self, comp_name: str, comp_type: str, parts: List[str]):
+        # Subcircuit/IC - variable number of nodes
+        # Last part is the subcircuit name
+        nodes = tuple(map(sys.intern, parts[1:-1]))
+        value = parts[-1]
+        self.components[comp_name] = Component(comp_name, comp_type, value, nodes)
+    
+    # Component type letter -> line handler
+    _HANDLERS = {
+        'R': _parse_rcl, 'C': _parse_rcl, 'L': _parse_rcl,
+        'D': _parse_diode,
+        'Q': _parse_bjt,
+        'M': _parse_mosfet,
+        'J': _parse_jfet,
+        'V': _parse_source, 'I': _parse_source,
+        'X': _parse_subcircuit, 'U': _parse_subcircuit,
+    }
     
     def _extract_value(self, parts: List[str]) -> str:
         """Extract component value from remaining parts"""
         if not parts:
             return ""
-        # First part is usually the value
-        value = parts[0]
-        # Clean up common suffixes
-        value = value.upper().replace('OHM', 'Ω').replace('OHMS', 'Ω')
-        return value
+        # First part is usually the value; clean up common suffixes
+        return self._OHM_RE.sub('Ω', parts[0].upper())
     
     def _extract_source_value(self, parts: List[str]) -> str:
         """Extract source value from remaining parts"""
@@ -219,11 +313,216 @@ class SPICEParser:
     
     def _build_connections(self):
         """Build connection map from components"""
+        connections = self.connections
         for comp_name, comp in self.components.items():
             for pin_idx, node in enumerate(comp.nodes):
-                if node not in self.connections:
-                    self.connections[node] = Connection(node, [])
-                self.connections[node].components.append((comp_name, pin_idx))
+                conn = connections.get(node)
+                if conn is None:
+                    conn = connections[node] = Connection(node, [], node.upper() in GROUND_NODES)
+                conn.components.append((comp_name, pin_idx))
+
+
+# =============================================================================
+# Symbol geometry
+# =============================================================================
+# Symbols are identical for every instance of a type, so each one is rendered
+# to SVG element strings once at import time (coordinates relative to center)
+# and emitted once per schematic as a <symbol> that instances <use>.
+
+def _build_resistor_path() -> str:
+    """IEEE-style zigzag with leads"""
+    points = []
+    w = 40  # Total width of zigzag
+    h = 8   # Height of zigzag peaks
+    segments = 6
+    step = w / segments
+    
+    points.append(f"M {-w//2 - 20} 0")  # Start lead
+    points.append(f"L {-w//2} 0")
+    
+    for i in range(segments):
+        x = -w//2 + i * step + step/2
+        peak = h if i % 2 == 0 else -h
+        points.append(f"L {x} {peak}")
+    
+    points.append(f"L {w//2} 0")
+    points.append(f"L {w//2 + 20} 0")  # End lead
+    return ' '.join(points)
+
+
+def _build_inductor_path() -> str:
+    """Coil loops with leads"""
+    num_loops = 4
+    loop_width = 12
+    total_width = num_loops * loop_width
+    start_x = -total_width // 2
+    
+    path_parts = [f"M {start_x - 20} 0 L {start_x} 0"]
+    for i in range(num_loops):
+        x = start_x + i * loop_width
+        path_parts.append(f"A {loop_width//2} {loop_width//2} 0 0 1 {x + loop_width} 0")
+    path_parts.append(f"L {start_x + total_width + 20} 0")
+    return ' '.join(path_parts)
+
+
+def _pin_label(x: int, y: int, text: str) -> str:
+    return f'<text x="{x}" y="{y}" class="pin-label" text-anchor="middle">{text}</text>'
+
+
+_RESISTOR_SYMBOL = (
+    f'<path d="{_build_resistor_path()}" class="symbol"/>',
+)
+
+_CAPACITOR_SYMBOL = (
+    '<line x1="-4" y1="-12" x2="-4" y2="12" class="symbol"/>',     # Left plate
+    '<line x1="4" y1="-12" x2="4" y2="12" class="symbol"/>',       # Right plate
+    '<line x1="-60" y1="0" x2="-4" y2="0" class="wire"/>',         # Connection leads
+    '<line x1="4" y1="0" x2="60" y2="0" class="wire"/>',
+)
+
+_INDUCTOR_SYMBOL = (
+    f'<path d="{_build_inductor_path()}" class="symbol"/>',
+)
+
+_DIODE_SYMBOL = (
+    '<polygon points="-16,-16 -16,16 16,0" class="symbol"/>',     # Triangle (pointing right)
+    '<line x1="16" y1="-16" x2="16" y2="16" class="symbol"/>',     # Cathode bar
+    '<line x1="-60" y1="0" x2="-16" y2="0" class="wire"/>',        # Connection leads
+    '<line x1="16" y1="0" x2="60" y2="0" class="wire"/>',
+)
+
+_BJT_SYMBOL = (
+    '<line x1="-10" y1="-20" x2="-10" y2="20" class="symbol"/>',   # Base line (vertical)
+    '<line x1="-10" y1="-10" x2="25" y2="-30" class="symbol"/>',   # Collector line
+    '<line x1="-10" y1="10" x2="25" y2="30" class="symbol"/>',     # Emitter line with arrow
+    '<polygon points="25,30 15,24 18,32" class="symbol-filled"/>', # Emitter arrow
+    '<line x1="-60" y1="0" x2="-10" y2="0" class="wire"/>',        # Base lead
+    '<line x1="25" y1="-30" x2="60" y2="-30" class="wire"/>',      # Collector lead
+    '<line x1="25" y1="30" x2="60" y2="30" class="wire"/>',        # Emitter lead
+    _pin_label(-30, -5, "B"),
+    _pin_label(40, -35, "C"),
+    _pin_label(40, 35, "E"),
+)
+
+_MOSFET_SYMBOL = (
+    '<line x1="-15" y1="-25" x2="-15" y2="25" class="symbol"/>',   # Gate line (vertical, with gap)
+    '<line x1="-5" y1="-25" x2="-5" y2="-8" class="symbol"/>',     # Channel line (vertical, broken)
+    '<line x1="-5" y1="-4" x2="-5" y2="4" class="symbol"/>',
+    '<line x1="-5" y1="8" x2="-5" y2="25" class="symbol"/>',
+    '<line x1="-5" y1="-20" x2="20" y2="-20" class="wire"/>',      # Drain connection
+    '<line x1="20" y1="-20" x2="20" y2="-35" class="wire"/>',
+    '<line x1="-5" y1="20" x2="20" y2="20" class="wire"/>',        # Source connection
+    '<line x1="20" y1="20" x2="20" y2="35" class="wire"/>',
+    '<polygon points="-5,0 5,-5 5,5" class="symbol-filled"/>',     # Arrow on source
+    '<line x1="-60" y1="0" x2="-15" y2="0" class="wire"/>',        # Gate lead
+    '<line x1="20" y1="-35" x2="60" y2="-35" class="wire"/>',      # Terminal leads
+    '<line x1="20" y1="35" x2="60" y2="35" class="wire"/>',
+    _pin_label(-35, -5, "G"),
+    _pin_label(40, -40, "D"),
+    _pin_label(40, 40, "S"),
+)
+
+_JFET_SYMBOL = (
+    '<line x1="0" y1="-25" x2="0" y2="25" class="symbol"/>',       # Channel line (vertical)
+    '<line x1="-25" y1="0" x2="0" y2="0" class="symbol"/>',        # Gate arrow
+    '<polygon points="-5,0 -12,-4 -12,4" class="symbol-filled"/>',
+    '<line x1="-60" y1="0" x2="-25" y2="0" class="wire"/>',        # Gate lead
+    '<line x1="0" y1="-25" x2="0" y2="-40" class="wire"/>',        # Drain lead
+    '<line x1="0" y1="-40" x2="60" y2="-40" class="wire"/>',
+    '<line x1="0" y1="25" x2="0" y2="40" class="wire"/>',          # Source lead
+    '<line x1="0" y1="40" x2="60" y2="40" class="wire"/>',
+)
+
+_VOLTAGE_SOURCE_SYMBOL = (
+    '<circle cx="0" cy="0" r="20" class="symbol"/>',
+    '<text x="0" y="-5" text-anchor="middle" class="polarity">+</text>',
+    '<text x="0" y="12" text-anchor="middle" class="polarity">−</text>',
+    '<line x1="0" y1="-20" x2="0" y2="-45" class="wire"/>',        # Connection leads (top)
+    '<line x1="0" y1="-45" x2="60" y2="-45" class="wire"/>',
+    '<line x1="0" y1="20" x2="0" y2="45" class="wire"/>',          # Connection leads (bottom)
+    '<line x1="0" y1="45" x2="60" y2="45" class="wire"/>',
+)
+
+_CURRENT_SOURCE_SYMBOL = (
+    '<circle cx="0" cy="0" r="20" class="symbol"/>',
+    '<line x1="0" y1="12" x2="0" y2="-12" class="symbol"/>',       # Arrow inside (pointing up)
+    '<polygon points="0,-12 -5,-4 5,-4" class="symbol-filled"/>',
+    '<line x1="-60" y1="0" x2="-20" y2="0" class="wire"/>',        # Connection leads
+    '<line x1="20" y1="0" x2="60" y2="0" class="wire"/>',
+)
+
+_GENERIC_SYMBOL = (
+    '<rect x="-25" y="-15" width="50" height="30" class="symbol"/>',
+    '<line x1="-60" y1="0" x2="-25" y2="0" class="wire"/>',        # Connection leads
+    '<line x1="25" y1="0" x2="60" y2="0" class="wire"/>',
+)
+
+# <symbol> id suffix -> geometry; component types without an entry use 'generic'
+_SYMBOL_GEOMETRY = {
+    'R': _RESISTOR_SYMBOL,
+    'C': _CAPACITOR_SYMBOL,
+    'L': _INDUCTOR_SYMBOL,
+    'D': _DIODE_SYMBOL,
+    'Q': _BJT_SYMBOL,
+    'M': _MOSFET_SYMBOL,
+    'J': _JFET_SYMBOL,
+    'V': _VOLTAGE_SOURCE_SYMBOL,
+    'I': _CURRENT_SOURCE_SYMBOL,
+    'generic': _GENERIC_SYMBOL,
+}
+
+# Complete, indented <symbol> blocks for <defs>, one fragment per symbol kind
+_SYMBOL_DEFS = {
+    key: f'    <symbol id="sym-{key}" overflow="visible">\n'
+         + ''.join(f'      {element}\n' for element in elements)
+         + '    </symbol>\n'
+    for key, elements in _SYMBOL_GEOMETRY.items()
+}
+
+def _symbol_key(comp_type: str) -> str:
+    """Symbol/port table key for a component type"""
+    return comp_type if comp_type in _SYMBOL_GEOMETRY else 'generic'
+
+
+# Port positions relative to the component center, in node order. Pins beyond
+# a component's node count are ignored (e.g. a 3-node MOSFET has no bulk).
+_PORTS_BY_TYPE = {
+    'R': ((-60, 0), (60, 0)),
+    'C': ((-60, 0), (60, 0)),
+    'L': ((-60, 0), (60, 0)),
+    'D': ((-60, 0), (60, 0)),                           # Anode, cathode
+    'Q': ((60, -30), (-60, 0), (60, 30)),               # Collector, base, emitter
+    'M': ((60, -35), (-60, 0), (60, 35), (60, 35)),     # Drain, gate, source, bulk (tied to source)
+    'J': ((60, -40), (-60, 0), (60, 40)),               # Drain, gate, source
+    'V': ((60, -45), (60, 45)),                         # Positive, negative
+    'I': ((-60, 0), (60, 0)),                           # Input, output
+    'generic': ((-60, 0), (60, 0)),
+}
+
+
+# Wire path data templates (bound format methods, no per-call f-string parsing).
+# Wires are axis-aligned, so H/V commands carry only the changing coordinate.
+_H_LINE_D = 'M {} {} H {}'.format
+_V_LINE_D = 'M {} {} V {}'.format
+_L_ROUTE_D = 'M {} {} H {} V {} H {}'.format
+_NODE_LABEL = '\n      <text x="{}" y="{}">{}</text>'.format
+
+# Per-component label group; label offsets are fixed, so only the transform,
+# name and value vary
+_LABEL_GROUP = (
+    '    <g {}>\n'
+    '      <text x="0" y="-35" class="comp-name">{}</text>\n'
+    '      <text x="0" y="50" class="comp-value">{}</text>\n'
+    '    </g>\n'
+).format
+
+
+def _dot_arcs(r: int) -> str:
+    """Relative arcs drawing a filled circle of radius r from its leftmost point.
+
+    Dots are 'M cx-r cy' plus this suffix, so they can share one <path>.
+    """
+    return f'a {r} {r} 0 1 0 {2 * r} 0 a {r} {r} 0 1 0 {-2 * r} 0'
 
 
 class SchematicRenderer:
@@ -247,74 +546,94 @@ class SchematicRenderer:
     COMP_SPACING_X = 180    # Horizontal spacing between components
     COMP_SPACING_Y = 140    # Vertical spacing between components
     COLS_MAX = 5            # Maximum columns before wrapping
+    WRITE_BUFFER = 1 << 20  # Output file buffer size (bytes)
+    JIT_MIN_PORTS = 4096    # Multi-way ports before bus points go through routing_kernels
+    NUMPY_MIN_FANOUT = 256  # Ports on one node before its median is taken with NumPy
     
-    def __init__(self, components: Dict[str, Component], connections: Dict[str, Connection], title: str = "Circuit Schematic"):
+    def __init__(self, components: Dict[str, Component], connections: Dict[str, Connection], title: str = "Circuit Schematic",
+                 sort_components: bool = False):
         self.components = components
         self.connections = connections
         self.title = title
+        self.sort_components = sort_components  # Alphabetical layout instead of netlist order
         self.width = 1200
         self.height = 800
-        self.node_positions: Dict[str, List[Tuple[int, int]]] = defaultdict(list)  # Track wire endpoints per node
+        self.node_positions: Dict[str, NodePorts] = defaultdict(NodePorts)  # Track wire endpoints per node
         
     def render(self, output_file: str):
         """Render the schematic to an SVG file"""
+        # Netlist (insertion) order unless sorting was requested; layout and
+        # drawing both walk the same list
+        ordered = sorted(self.components.items()) if self.sort_components else list(self.components.items())
+        
         # Calculate layout
-        self._calculate_layout()
+        self._calculate_layout(ordered)
         
         # Adjust canvas size based on component positions
         self._adjust_canvas_size()
         
-        # Create SVG root
-        root = ET.Element('svg', {
-            'xmlns': 'http://www.w3.org/2000/svg',
-            'viewBox': f'0 0 {self.width} {self.height}',
-            'width': str(self.width),
-            'height': str(self.height),
-            'style': 'background-color: white;'
-        })
-        
-        # Add defs for markers and patterns
-        self._add_defs(root)
-        
-        # Add stylesheet
-        self._add_styles(root)
-        
-        # Add title
-        self._add_title(root)
-        
-        # Create groups for layering
-        wires_group = ET.SubElement(root, 'g', {'id': 'wires', 'class': 'wires-layer'})
-        components_group = ET.SubElement(root, 'g', {'id': 'components', 'class': 'components-layer'})
-        labels_group = ET.SubElement(root, 'g', {'id': 'labels', 'class': 'labels-layer'})
-        
-        # Draw components first to get port positions
-        for comp_name, comp in sorted(self.components.items()):
-            self._draw_component(components_group, labels_group, comp)
-        
-        # Draw wires between connected components
-        self._draw_all_connections(wires_group)
-        
-        # Add legend
-        self._add_legend(root)
-        
-        # Save to file
-        self._save_svg(root, output_file)
+        # Ports are registered up front so the wires layer, which sits
+        # underneath the components, can be routed and written first
+        for comp_name, comp in ordered:
+            self._register_ports(comp)
+        
+        # SVG is emitted directly as text fragments and streamed to disk one
+        # section at a time, so only the layer being built is held in memory
+        with open(output_file, 'w', encoding='utf-8', newline='\n', buffering=self.WRITE_BUFFER) as f:
+            out: List[str] = [
+                f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 {self.width} {self.height}" '
+                f'width="{self.width}" height="{self.height}" style="background-color: white;">\n'
+            ]
+            
+            # Add defs for markers and patterns
+            self._add_defs(out)
+            
+            # Add stylesheet
+            self._add_styles(out)
+            
+            # Add title
+            self._add_title(out)
+            f.writelines(out)
+            out.clear()
+            
+            # Draw wires between connected components
+            wires_buf: List[str] = []
+            self._draw_all_connections(wires_buf)
+            self._add_group(out, 'id="wires" class="wires-layer"', wires_buf, '  ')
+            f.writelines(out)
+            out.clear()
+            del wires_buf
+            
+            # Components, then their labels on top
+            components_buf: List[str] = []
+            labels_buf: List[str] = []
+            for comp_name, comp in ordered:
+                self._draw_component(components_buf, labels_buf, comp)
+            self._add_layer(out, 'id="components" class="components-layer"', components_buf)
+            f.writelines(out)
+            out.clear()
+            del components_buf
+            # text-anchor is inherited by every component label in the layer
+            self._add_layer(out, 'id="labels" class="labels-layer" text-anchor="middle"', labels_buf)
+            
+            # Add legend
+            self._add_legend(out)
+            
+            out.append('</svg>\n')
+            f.writelines(out)
         
         print(f"✓ Schematic saved to: {output_file}")
         print(f"  - {len(self.components)} components")
         print(f"  - {len(self.connections)} nodes")
     
-    def _calculate_layout(self):
+    def _calculate_layout(self, ordered: List[Tuple[str, Component]]):
         """Calculate component positions using a grid layout"""
-        comp_list = sorted(self.components.keys())
-        
         # Calculate grid dimensions
-        num_components = len(comp_list)
+        num_components = len(ordered)
         cols = min(self.COLS_MAX, num_components)
-        rows = math.ceil(num_components / cols)
+        rows = -(-num_components // cols)
         
-        for idx, comp_name in enumerate(comp_list):
-            comp = self.components[comp_name]
+        for idx, (comp_name, comp) in enumerate(ordered):
             col = idx % cols
             row = idx // cols
             
@@ -323,42 +642,55 @@ class SchematicRenderer:
     
     def _adjust_canvas_size(self):
         """Adjust canvas size to fit all components"""
-        max_x = max_y = 0
-        for comp in self.components.values():
-            max_x = max(max_x, comp.x + self.COMP_SPACING_X)
-            max_y = max(max_y, comp.y + self.COMP_SPACING_Y)
+        comps = self.components.values()
+        max_x = max((c.x for c in comps), default=0) + self.COMP_SPACING_X
+        max_y = max((c.y for c in comps), default=0) + self.COMP_SPACING_Y
         
         self.width = max(self.width, max_x + self.MARGIN)
         self.height = max(self.height, max_y + self.MARGIN + 50)  # Extra space for legend
     
-    def _add_defs(self, root: ET.Element):
-        """Add SVG definitions for markers and gradients"""
-        defs = ET.SubElement(root, 'defs')
-        
-        # Arrow marker for current sources
-        marker = ET.SubElement(defs, 'marker', {
-            'id': 'arrowhead',
-            'markerWidth': '10',
-            'markerHeight': '7',
-            'refX': '9',
-            'refY': '3.5',
-            'orient': 'auto'
-        })
-        ET.SubElement(marker, 'polygon', {
-            'points': '0 0, 10 3.5, 0 7',
-            'fill': 'black'
-        })
+    @staticmethod
+    def _add_group(out: List[str], attrs: str, children: List[str], indent: str):
+        """Wrap pre-rendered child elements in a <g> at the given indentation"""
+        if not children:
+            out.append(f'{indent}<g {attrs}/>\n')
+            return
+        sep = f'\n{indent}  '
+        out.append(f'{indent}<g {attrs}>{sep}{sep.join(children)}\n{indent}</g>\n')
+    
+    @staticmethod
+    def _add_layer(out: List[str], attrs: str, fragments: List[str]):
+        """Wrap already-indented group fragments in a top-level layer <g>"""
+        if not fragments:
+            out.append(f'  <g {attrs}/>\n')
+            return
+        out.append(f'  <g {attrs}>\n')
+        out.extend(fragments)
+        out.append('  </g>\n')
     
-    def _add_styles(self, root: ET.Element):
+    def _add_defs(self, out: List[str]):
+        """Add SVG definitions for markers and component symbols"""
+        # Arrow marker for current sources
+        out.append(
+            '  <defs>\n'
+            '    <marker id="arrowhead" markerWidth="10" markerHeight="7" refX="9" refY="3.5" orient="auto">\n'
+            '      <polygon points="0 0, 10 3.5, 0 7" fill="black"/>\n'
+            '    </marker>\n'
+        )
+        
+        # One <symbol> per symbol kind actually used in this schematic
+        used = {_symbol_key(c.type) for c in self.components.values()}
+        out.extend(_SYMBOL_DEFS[key] for key in sorted(used))
+        out.append('  </defs>\n')
+    
+    def _add_styles(self, out: List[str]):
         """Add CSS styles for consistent black and white rendering"""
-        style = ET.SubElement(root, 'style')
-        style.text = """
+        out.append("""  <style>
             /* Base styles */
             .wire { stroke: #000000; stroke-width: 2; fill: none; stroke-linecap: round; stroke-linejoin: round; }
             .symbol { stroke: #000000; stroke-width: 2; fill: none; stroke-linecap: round; stroke-linejoin: round; }
             .symbol-filled { stroke: #000000; stroke-width: 2; fill: #000000; }
             .connection-dot { fill: #000000; stroke: none; }
-            
             /* Text styles */
             .title-text { font-family: 'Arial', 'Helvetica', sans-serif; font-size: 18px; font-weight: bold; fill: #000000; }
             .comp-name { font-family: 'Arial', 'Helvetica', sans-serif; font-size: 12px; font-weight: bold; fill: #000000; }
@@ -366,658 +698,203 @@ class SchematicRenderer:
             .node-label { font-family: 'Courier New', monospace; font-size: 9px; fill: #444444; }
             .pin-label { font-family: 'Arial', 'Helvetica', sans-serif; font-size: 8px; fill: #666666; }
             .legend-text { font-family: 'Arial', 'Helvetica', sans-serif; font-size: 10px; fill: #000000; }
-            
             /* Plus/minus symbols */
             .polarity { font-family: 'Arial', 'Helvetica', sans-serif; font-size: 14px; font-weight: bold; fill: #000000; }
-        """
+        </style>
+""")
     
-    def _add_title(self, root: ET.Element):
+    def _add_title(self, out: List[str]):
         """Add schematic title"""
-        title_group = ET.SubElement(root, 'g', {'id': 'title'})
-        
-        # Title text
-        title_elem = ET.SubElement(title_group, 'text', {
-            'x': str(self.MARGIN),
-            'y': str(self.MARGIN // 2 + 10),
-            'class': 'title-text'
-        })
-        title_elem.text = self.title
-        
-        # Underline
-        ET.SubElement(title_group, 'line', {
-            'x1': str(self.MARGIN),
-            'y1': str(self.MARGIN // 2 + 15),
-            'x2': str(self.MARGIN + len(self.title) * 10),
-            'y2': str(self.MARGIN // 2 + 15),
-            'class': 'wire'
-        })
-    
-    def _add_legend(self, root: ET.Element):
+        y = self.MARGIN // 2
+        self._add_group(out, 'id="title"', [
+            # Title text
+            f'<text x="{self.MARGIN}" y="{y + 10}" class="title-text">{_escape(self.title)}</text>',
+            # Underline
+            f'<line x1="{self.MARGIN}" y1="{y + 15}" x2="{self.MARGIN + len(self.title) * 10}" '
+            f'y2="{y + 15}" class="wire"/>',
+        ], '  ')
+    
+    def _add_legend(self, out: List[str]):
         """Add component count legend"""
         legend_y = self.height - 30
         legend_x = self.MARGIN
         
-        legend_group = ET.SubElement(root, 'g', {'id': 'legend'})
-        
         # Count components by type
-        type_counts = defaultdict(int)
-        for comp in self.components.values():
-            type_counts[comp.type] += 1
+        type_counts = Counter(comp.type for comp in self.components.values())
         
         legend_text = "Components: " + ", ".join([f"{SPICEParser.COMPONENT_TYPES.get(t, t)}s: {c}" for t, c in sorted(type_counts.items())])
         
-        text_elem = ET.SubElement(legend_group, 'text', {
-            'x': str(legend_x),
-            'y': str(legend_y),
-            'class': 'legend-text'
-        })
-        text_elem.text = legend_text
+        self._add_group(out, 'id="legend"', [
+            f'<text x="{legend_x}" y="{legend_y}" class="legend-text">{_escape(legend_text)}</text>',
+        ], '  ')
     
-    def _draw_component(self, comp_group: ET.Element, label_group: ET.Element, comp: Component):
+    def _draw_component(self, comp_buf: List[str], label_buf: List[str], comp: Component):
         """Draw a component symbol with labels"""
         x, y = comp.x, comp.y
         
-        # Create component group
-        g = ET.SubElement(comp_group, 'g', {
-            'id': f'comp-{comp.name}',
-            'transform': f'translate({x}, {y})'
-        })
+        # Symbol geometry is shared by every instance of a type
+        g = [f'<use href="#sym-{_symbol_key(comp.type)}"/>']
         
-        # Draw symbol based on type
-        if comp.type == 'R':
-            self._draw_resistor_symbol(g, comp)
-        elif comp.type == 'C':
-            self._draw_capacitor_symbol(g, comp)
-        elif comp.type == 'L':
-            self._draw_inductor_symbol(g, comp)
-        elif comp.type == 'D':
-            self._draw_diode_symbol(g, comp)
-        elif comp.type == 'Q':
-            self._draw_bjt_symbol(g, comp)
-        elif comp.type == 'M':
-            self._draw_mosfet_symbol(g, comp)
-        elif comp.type == 'J':
-            self._draw_jfet_symbol(g, comp)
-        elif comp.type == 'V':
-            self._draw_voltage_source_symbol(g, comp)
-        elif comp.type == 'I':
-            self._draw_current_source_symbol(g, comp)
-        else:
-            self._draw_generic_symbol(g, comp)
+        # Create component group; each group is a single fragment in its layer buffer
+        transform = f'transform="translate({x}, {y})"'
+        self._add_group(comp_buf, f'id="comp-{_escape_attr(comp.name)}" {transform}', g, '    ')
         
         # Add labels in label group (so they appear on top)
-        label_g = ET.SubElement(label_group, 'g', {'transform': f'translate({x}, {y})'})
-        self._add_component_labels(label_g, comp)
-        
-        # Register port positions for wire routing
-        self._register_ports(comp)
-    
-    def _draw_resistor_symbol(self, g: ET.Element, comp: Component):
-        """Draw IEEE-style resistor (zigzag)"""
-        # Zigzag pattern
-        points = []
-        w = 40  # Total width of zigzag
-        h = 8   # Height of zigzag peaks
-        segments = 6
-        step = w / segments
-        
-        points.append(f"M {-w//2 - 20} 0")  # Start lead
-        points.append(f"L {-w//2} 0")
-        
-        for i in range(segments):
-            x = -w//2 + i * step + step/2
-            peak = h if i % 2 == 0 else -h
-            points.append(f"L {x} {peak}")
-        
-        points.append(f"L {w//2} 0")
-        points.append(f"L {w//2 + 20} 0")  # End lead
-        
-        ET.SubElement(g, 'path', {
-            'd': ' '.join(points),
-            'class': 'symbol'
-        })
-        
-        # Store port positions (relative to component center)
-        comp.ports[0] = (-60, 0)  # Left terminal
-        comp.ports[1] = (60, 0)   # Right terminal
-    
-    def _draw_capacitor_symbol(self, g: ET.Element, comp: Component):
-        """Draw capacitor symbol (two parallel plates)"""
-        plate_height = 24
-        gap = 8
-        
-        # Left plate
-        ET.SubElement(g, 'line', {
-            'x1': str(-gap//2), 'y1': str(-plate_height//2),
-            'x2': str(-gap//2), 'y2': str(plate_height//2),
-            'class': 'symbol'
-        })
-        
-        # Right plate
-        ET.SubElement(g, 'line', {
-            'x1': str(gap//2), 'y1': str(-plate_height//2),
-            'x2': str(gap//2), 'y2': str(plate_height//2),
-            'class': 'symbol'
-        })
-        
-        # Connection leads
-        ET.SubElement(g, 'line', {
-            'x1': '-60', 'y1': '0',
-            'x2': str(-gap//2), 'y2': '0',
-            'class': 'wire'
-        })
-        ET.SubElement(g, 'line', {
-            'x1': str(gap//2), 'y1': '0',
-            'x2': '60', 'y2': '0',
-            'class': 'wire'
-        })
-        
-        comp.ports[0] = (-60, 0)
-        comp.ports[1] = (60, 0)
-    
-    def _draw_inductor_symbol(self, g: ET.Element, comp: Component):
-        """Draw inductor symbol (coil loops)"""
-        num_loops = 4
-        loop_width = 12
-        total_width = num_loops * loop_width
-        start_x = -total_width // 2
-        
-        # Draw arcs for coil
-        path_parts = [f"M {start_x - 20} 0 L {start_x} 0"]
-        for i in range(num_loops):
-            x = start_x + i * loop_width
-            path_parts.append(f"A {loop_width//2} {loop_width//2} 0 0 1 {x + loop_width} 0")
-        path_parts.append(f"L {start_x + total_width + 20} 0")
-        
-        ET.SubElement(g, 'path', {
-            'd': ' '.join(path_parts),
-            'class': 'symbol'
-        })
-        
-        comp.ports[0] = (-60, 0)
-        comp.ports[1] = (60, 0)
-    
-    def _draw_diode_symbol(self, g: ET.Element, comp: Component):
-        """Draw diode symbol (triangle with bar)"""
-        size = 16
-        
-        # Triangle (pointing right)
-        ET.SubElement(g, 'polygon', {
-            'points': f'{-size},{ -size} {-size},{size} {size},0',
-            'class': 'symbol'
-        })
-        
-        # Cathode bar
-        ET.SubElement(g, 'line', {
-            'x1': str(size), 'y1': str(-size),
-            'x2': str(size), 'y2': str(size),
-            'class': 'symbol'
-        })
-        
-        # Connection leads
-        ET.SubElement(g, 'line', {
-            'x1': '-60', 'y1': '0',
-            'x2': str(-size), 'y2': '0',
-            'class': 'wire'
-        })
-        ET.SubElement(g, 'line', {
-            'x1': str(size), 'y1': '0',
-            'x2': '60', 'y2': '0',
-            'class': 'wire'
-        })
-        
-        comp.ports[0] = (-60, 0)  # Anode
-        comp.ports[1] = (60, 0)   # Cathode
-    
-    def _draw_bjt_symbol(self, g: ET.Element, comp: Component):
-        """Draw NPN BJT symbol"""
-        # Base line (vertical)
-        ET.SubElement(g, 'line', {
-            'x1': '-10', 'y1': '-20',
-            'x2': '-10', 'y2': '20',
-            'class': 'symbol'
-        })
-        
-        # Collector line
-        ET.SubElement(g, 'line', {
-            'x1': '-10', 'y1': '-10',
-            'x2': '25', 'y2': '-30',
-            'class': 'symbol'
-        })
-        
-        # Emitter line with arrow
-        ET.SubElement(g, 'line', {
-            'x1': '-10', 'y1': '10',
-            'x2': '25', 'y2': '30',
-            'class': 'symbol'
-        })
-        
-        # Emitter arrow
-        ET.SubElement(g, 'polygon', {
-            'points': '25,30 15,24 18,32',
-            'class': 'symbol-filled'
-        })
-        
-        # Connection leads
-        ET.SubElement(g, 'line', {  # Base
-            'x1': '-60', 'y1': '0',
-            'x2': '-10', 'y2': '0',
-            'class': 'wire'
-        })
-        ET.SubElement(g, 'line', {  # Collector
-            'x1': '25', 'y1': '-30',
-            'x2': '60', 'y2': '-30',
-            'class': 'wire'
-        })
-        ET.SubElement(g, 'line', {  # Emitter
-            'x1': '25', 'y1': '30',
-            'x2': '60', 'y2': '30',
-            'class': 'wire'
-        })
-        
-        # Pin labels
-        self._add_pin_label(g, -30, -5, "B")
-        self._add_pin_label(g, 40, -35, "C")
-        self._add_pin_label(g, 40, 35, "E")
-        
-        comp.ports[0] = (60, -30)  # Collector
-        comp.ports[1] = (-60, 0)   # Base
-        comp.ports[2] = (60, 30)   # Emitter
-    
-    def _draw_mosfet_symbol(self, g: ET.Element, comp: Component):
-        """Draw N-channel MOSFET symbol"""
-        # Gate line (vertical, with gap)
-        ET.SubElement(g, 'line', {
-            'x1': '-15', 'y1': '-25',
-            'x2': '-15', 'y2': '25',
-            'class': 'symbol'
-        })
-        
-        # Channel line (vertical, broken)
-        ET.SubElement(g, 'line', {
-            'x1': '-5', 'y1': '-25',
-            'x2': '-5', 'y2': '-8',
-            'class': 'symbol'
-        })
-        ET.SubElement(g, 'line', {
-            'x1': '-5', 'y1': '-4',
-            'x2': '-5', 'y2': '4',
-            'class': 'symbol'
-        })
-        ET.SubElement(g, 'line', {
-            'x1': '-5', 'y1': '8',
-            'x2': '-5', 'y2': '25',
-            'class': 'symbol'
-        })
-        
-        # Drain connection
-        ET.SubElement(g, 'line', {
-            'x1': '-5', 'y1': '-20',
-            'x2': '20', 'y2': '-20',
-            'class': 'wire'
-        })
-        ET.SubElement(g, 'line', {
-            'x1': '20', 'y1': '-20',
-            'x2': '20', 'y2': '-35',
-            'class': 'wire'
-        })
-        
-        # Source connection
-        ET.SubElement(g, 'line', {
-            'x1': '-5', 'y1': '20',
-            'x2': '20', 'y2': '20',
-            'class': 'wire'
-        })
-        ET.SubElement(g, 'line', {
-            'x1': '20', 'y1': '20',
-            'x2': '20', 'y2': '35',
-            'class': 'wire'
-        })
-        
-        # Arrow on source
-        ET.SubElement(g, 'polygon', {
-            'points': '-5,0 5,-5 5,5',
-            'class': 'symbol-filled'
-        })
-        
-        # Gate lead
-        ET.SubElement(g, 'line', {
-            'x1': '-60', 'y1': '0',
-            'x2': '-15', 'y2': '0',
-            'class': 'wire'
-        })
-        
-        # Terminal leads
-        ET.SubElement(g, 'line', {
-            'x1': '20', 'y1': '-35',
-            'x2': '60', 'y2': '-35',
-            'class': 'wire'
-        })
-        ET.SubElement(g, 'line', {
-            'x1': '20', 'y1': '35',
-            'x2': '60', 'y2': '35',
-            'class': 'wire'
-        })
-        
-        # Pin labels
-        self._add_pin_label(g, -35, -5, "G")
-        self._add_pin_label(g, 40, -40, "D")
-        self._add_pin_label(g, 40, 40, "S")
-        
-        comp.ports[0] = (60, -35)  # Drain
-        comp.ports[1] = (-60, 0)   # Gate
-        comp.ports[2] = (60, 35)   # Source
-        if len(comp.nodes) > 3:
-            comp.ports[3] = (60, 35)  # Bulk (tied to source)
-    
-    def _draw_jfet_symbol(self, g: ET.Element, comp: Component):
-        """Draw N-channel JFET symbol"""
-        # Channel line (vertical)
-        ET.SubElement(g, 'line', {
-            'x1': '0', 'y1': '-25',
-            'x2': '0', 'y2': '25',
-            'class': 'symbol'
-        })
-        
-        # Gate arrow
-        ET.SubElement(g, 'line', {
-            'x1': '-25', 'y1': '0',
-            'x2': '0', 'y2': '0',
-            'class': 'symbol'
-        })
-        ET.SubElement(g, 'polygon', {
-            'points': '-5,0 -12,-4 -12,4',
-            'class': 'symbol-filled'
-        })
-        
-        # Terminal leads
-        ET.SubElement(g, 'line', {  # Gate
-            'x1': '-60', 'y1': '0',
-            'x2': '-25', 'y2': '0',
-            'class': 'wire'
-        })
-        ET.SubElement(g, 'line', {  # Drain
-            'x1': '0', 'y1': '-25',
-            'x2': '0', 'y2': '-40',
-            'class': 'wire'
-        })
-        ET.SubElement(g, 'line', {
-            'x1': '0', 'y1': '-40',
-            'x2': '60', 'y2': '-40',
-            'class': 'wire'
-        })
-        ET.SubElement(g, 'line', {  # Source
-            'x1': '0', 'y1': '25',
-            'x2': '0', 'y2': '40',
-            'class': 'wire'
-        })
-        ET.SubElement(g, 'line', {
-            'x1': '0', 'y1': '40',
-            'x2': '60', 'y2': '40',
-            'class': 'wire'
-        })
-        
-        comp.ports[0] = (60, -40)  # Drain
-        comp.ports[1] = (-60, 0)   # Gate
-        comp.ports[2] = (60, 40)   # Source
-    
-    def _draw_voltage_source_symbol(self, g: ET.Element, comp: Component):
-        """Draw DC/AC voltage source symbol"""
-        radius = 20
-        
-        # Circle
-        ET.SubElement(g, 'circle', {
-            'cx': '0', 'cy': '0', 'r': str(radius),
-            'class': 'symbol'
-        })
-        
-        # Plus and minus signs
-        plus = ET.SubElement(g, 'text', {
-            'x': '0', 'y': '-5',
-            'text-anchor': 'middle',
-            'class': 'polarity'
-        })
-        plus.text = '+'
-        
-        minus = ET.SubElement(g, 'text', {
-            'x': '0', 'y': '12',
-            'text-anchor': 'middle',
-            'class': 'polarity'
-        })
-        minus.text = '−'
-        
-        # Connection leads (top and bottom)
-        ET.SubElement(g, 'line', {
-            'x1': '0', 'y1': str(-radius),
-            'x2': '0', 'y2': str(-radius - 25),
-            'class': 'wire'
-        })
-        ET.SubElement(g, 'line', {
-            'x1': '0', 'y1': str(-radius - 25),
-            'x2': '60', 'y2': str(-radius - 25),
-            'class': 'wire'
-        })
-        
-        ET.SubElement(g, 'line', {
-            'x1': '0', 'y1': str(radius),
-            'x2': '0', 'y2': str(radius + 25),
-            'class': 'wire'
-        })
-        ET.SubElement(g, 'line', {
-            'x1': '0', 'y1': str(radius + 25),
-            'x2': '60', 'y2': str(radius + 25),
-            'class': 'wire'
-        })
-        
-        comp.ports[0] = (60, -45)  # Positive
-        comp.ports[1] = (60, 45)   # Negative
-    
-    def _draw_current_source_symbol(self, g: ET.Element, comp: Component):
-        """Draw current source symbol"""
-        radius = 20
-        
-        # Circle
-        ET.SubElement(g, 'circle', {
-            'cx': '0', 'cy': '0', 'r': str(radius),
-            'class': 'symbol'
-        })
-        
-        # Arrow inside (pointing up)
-        ET.SubElement(g, 'line', {
-            'x1': '0', 'y1': '12',
-            'x2': '0', 'y2': '-12',
-            'class': 'symbol'
-        })
-        ET.SubElement(g, 'polygon', {
-            'points': '0,-12 -5,-4 5,-4',
-            'class': 'symbol-filled'
-        })
-        
-        # Connection leads
-        ET.SubElement(g, 'line', {
-            'x1': '-60', 'y1': '0',
-            'x2': str(-radius), 'y2': '0',
-            'class': 'wire'
-        })
-        ET.SubElement(g, 'line', {
-            'x1': str(radius), 'y1': '0',
-            'x2': '60', 'y2': '0',
-            'class': 'wire'
-        })
-        
-        comp.ports[0] = (-60, 0)  # Input
-        comp.ports[1] = (60, 0)   # Output
-    
-    def _draw_generic_symbol(self, g: ET.Element, comp: Component):
-        """Draw generic component (box) for unknown types"""
-        box_w, box_h = 50, 30
-        
-        ET.SubElement(g, 'rect', {
-            'x': str(-box_w//2),
-            'y': str(-box_h//2),
-            'width': str(box_w),
-            'height': str(box_h),
-            'class': 'symbol'
-        })
-        
-        # Connection leads
-        ET.SubElement(g, 'line', {
-            'x1': '-60', 'y1': '0',
-            'x2': str(-box_w//2), 'y2': '0',
-            'class': 'wire'
-        })
-        ET.SubElement(g, 'line', {
-            'x1': str(box_w//2), 'y1': '0',
-            'x2': '60', 'y2': '0',
-            'class': 'wire'
-        })
-        
-        comp.ports[0] = (-60, 0)
-        comp.ports[1] = (60, 0)
-    
-    def _add_pin_label(self, g: ET.Element, x: int, y: int, text: str):
-        """Add a pin label"""
-        label = ET.SubElement(g, 'text', {
-            'x': str(x),
-            'y': str(y),
-            'class': 'pin-label',
-            'text-anchor': 'middle'
-        })
-        label.text = text
+        self._add_component_labels(label_buf, comp, transform)
     
-    def _add_component_labels(self, g: ET.Element, comp: Component):
-        """Add component name and value labels"""
-        # Component name (above)
-        name_label = ET.SubElement(g, 'text', {
-            'x': '0',
-            'y': str(-35),
-            'text-anchor': 'middle',
-            'class': 'comp-name'
-        })
-        name_label.text = comp.name
-        
-        # Component value (below)
-        value_label = ET.SubElement(g, 'text', {
-            'x': '0',
-            'y': str(50),
-            'text-anchor': 'middle',
-            'class': 'comp-value'
-        })
-        value_label.text = comp.value
+    def _add_component_labels(self, label_buf: List[str], comp: Component, transform: str):
+        """Add component name (above) and value (below) labels as one group"""
+        label_buf.append(_LABEL_GROUP(transform, _escape(comp.name), _escape(comp.value)))
     
     def _register_ports(self, comp: Component):
         """Register component port positions for wire routing"""
-        for pin_idx, (rel_x, rel_y) in comp.ports.items():
-            if pin_idx < len(comp.nodes):
-                node = comp.nodes[pin_idx]
-                abs_x = comp.x + rel_x
-                abs_y = comp.y + rel_y
-                self.node_positions[node].append((abs_x, abs_y, comp.name, pin_idx))
-    
-    def _draw_all_connections(self, wires_group: ET.Element):
+        # Port layout is shared by every instance of a type
+        comp.ports = _PORTS_BY_TYPE[_symbol_key(comp.type)]
+        x, y, name = comp.x, comp.y, comp.name
+        # zip() drops ports beyond the component's node count
+        for pin_idx, (node, (rel_x, rel_y)) in enumerate(zip(comp.nodes, comp.ports)):
+            ports = self.node_positions[node]
+            ports.xs.append(x + rel_x)
+            ports.ys.append(y + rel_y)
+            ports.comp_names.append(name)
+            ports.pins.append(pin_idx)
+    
+    def _draw_all_connections(self, wires: List[str]):
         """Draw all wire connections between components"""
+        # Split nets by size class once so each kind runs in its own loop;
+        # single-port nodes have nothing to draw. Two-port endpoints get no
+        # dots but still suppress multi-port dots at the same spot.
+        two_nets: List[NodePorts] = []
+        multi_nets: List[Tuple[str, NodePorts]] = []
         drawn_dots: Set[Tuple[int, int]] = set()
-        
-        for node, positions in self.node_positions.items():
-            if len(positions) < 2:
-                continue
-            
-            # Skip ground node visual clutter (just draw dots)
-            is_ground = node.upper() in ['0', 'GND', 'VSS', 'GROUND']
+        for node, ports in self.node_positions.items():
+            n = len(ports.xs)
+            if n == 2:
+                two_nets.append(ports)
+                drawn_dots.update(zip(ports.xs, ports.ys))
+            elif n > 2:
+                multi_nets.append((node, ports))
+        
+        connections = self.connections
+        bus = self._batch_bus_points(multi_nets)
+        draw_wire = self._draw_wire  # Bound once; called per port
+        mark_dot = drawn_dots.add
+        
+        # All wire segments share one <path>; dot coordinates are collected
+        # here and emitted together as one <path> after the loop
+        wire_d: List[str] = []
+        routed: Set[Tuple[int, int, int, int]] = set()
+        bus_dots: List[Tuple[int, int]] = []
+        end_dots: List[Tuple[int, int]] = []
+        node_labels: List[str] = []
+        
+        for k, (node, ports) in enumerate(multi_nets):
+            xs, ys = ports.xs, ports.ys
+            n = len(xs)
             
-            if len(positions) == 2:
-                # Direct connection between two points
-                (x1, y1, _, _), (x2, y2, _, _) = positions
-                self._draw_wire(wires_group, x1, y1, x2, y2)
+            # Multiple connections - use a bus point at the per-axis median,
+            # which minimizes total Manhattan wire length to the ports
+            mid = n // 2
+            if bus is not None:
+                bus_x, bus_y = bus[k]
+            elif n >= self.NUMPY_MIN_FANOUT and (np := _numpy()) is not None:
+                # Selection in C beats sorting lists once a node is this wide
+                bus_x = int(np.partition(np.fromiter(xs, np.int64, n), mid)[mid])
+                bus_y = int(np.partition(np.fromiter(ys, np.int64, n), mid)[mid])
             else:
-                # Multiple connections - use a bus point
-                # Find central point
-                avg_x = sum(p[0] for p in positions) // len(positions)
-                avg_y = sum(p[1] for p in positions) // len(positions)
-                
-                # Draw wires from each port to the bus point
-                for x, y, comp_name, pin_idx in positions:
-                    self._draw_wire(wires_group, x, y, avg_x, avg_y)
+                bus_x = sorted(xs)[mid]
+                bus_y = sorted(ys)[mid]
+            
+            # Connection dot at bus point
+            if (bus_x, bus_y) not in drawn_dots:
+                bus_dots.append((bus_x, bus_y))
+                drawn_dots.add((bus_x, bus_y))
                 
-                # Draw connection dot at bus point
-                if (avg_x, avg_y) not in drawn_dots:
-                    ET.SubElement(wires_group, 'circle', {
-                        'cx': str(avg_x),
-                        'cy': str(avg_y),
-                        'r': str(self.DOT_RADIUS),
-                        'class': 'connection-dot'
-                    })
-                    drawn_dots.add((avg_x, avg_y))
-                    
-                    # Add node label
-                    if not is_ground:
-                        label = ET.SubElement(wires_group, 'text', {
-                            'x': str(avg_x + 8),
-                            'y': str(avg_y - 8),
-                            'class': 'node-label'
-                        })
-                        label.text = node
+                # Add node label; skip ground node visual clutter (just draw dots)
+                if not connections[node].is_ground:
+                    node_labels.append(_NODE_LABEL(bus_x + 8, bus_y - 8, _escape(node)))
             
-            # Draw connection dots at each endpoint
-            for x, y, _, _ in positions:
-                if (x, y) not in drawn_dots:
-                    if len(positions) > 2:  # Only draw dots for multi-way connections
-                        ET.SubElement(wires_group, 'circle', {
-                            'cx': str(x),
-                            'cy': str(y),
-                            'r': str(self.DOT_RADIUS - 1),
-                            'class': 'connection-dot'
-                        })
-                    drawn_dots.add((x, y))
-    
-    def _draw_wire(self, parent: ET.Element, x1: int, y1: int, x2: int, y2: int):
-        """Draw a wire between two points using orthogonal routing"""
-        # Use L-shaped routing for cleaner look
-        if x1 == x2 or y1 == y2:
-            # Direct horizontal or vertical line
-            ET.SubElement(parent, 'line', {
-                'x1': str(x1), 'y1': str(y1),
-                'x2': str(x2), 'y2': str(y2),
-                'class': 'wire'
-            })
+            # Wires and endpoint dots in one walk over the parallel coordinate
+            # lists; the bus point above already needed its own pass (sort or
+            # selection), so this is the only per-port loop
+            for x, y in zip(xs, ys):
+                draw_wire(wire_d, routed, x, y, bus_x, bus_y)
+                pt = (x, y)
+                if pt not in drawn_dots:
+                    end_dots.append(pt)
+                    mark_dot(pt)
+        
+        # Direct connections between two points get no dots
+        for ports in two_nets:
+            x1, x2 = ports.xs
+            y1, y2 = ports.ys
+            draw_wire(wire_d, routed, x1, y1, x2, y2)
+        
+        if wire_d:
+            wires.append(f'<path d="{" ".join(wire_d)}" class="wire"/>')
+        if bus_dots or end_dots:
+            r = self.DOT_RADIUS
+            arcs = _dot_arcs(r)
+            dot_d = [f'M {x - r} {y} {arcs}' for x, y in bus_dots]
+            r -= 1
+            arcs = _dot_arcs(r)
+            dot_d.extend([f'M {x - r} {y} {arcs}' for x, y in end_dots])
+            wires.append(f'<path d="{" ".join(dot_d)}" class="connection-dot"/>')
+        if node_labels:
+            # Node labels take their style from one wrapping group
+            wires.append(f'<g class="node-label">{"".join(node_labels)}\n    </g>')
+    
+    def _batch_bus_points(self, multi: List[Tuple[str, NodePorts]]) -> Optional[List[Tuple[int, int]]]:
+        """Bus points of all multi-way nodes, in order, from one JIT kernel call (large netlists only)"""
+        total = sum(len(ports.xs) for _, ports in multi)
+        if total < self.JIT_MIN_PORTS:
+            return None
+        kernels = _routing_kernels()
+        if kernels is None:
+            return None
+        np = _numpy()  # routing_kernels already imported it
+        
+        xs = np.fromiter(chain.from_iterable(ports.xs for _, ports in multi), dtype=np.int64, count=total)
+        ys = np.fromiter(chain.from_iterable(ports.ys for _, ports in multi), dtype=np.int64, count=total)
+        offsets = np.zeros(len(multi) + 1, dtype=np.int64)
+        np.cumsum([len(ports.xs) for _, ports in multi], out=offsets[1:])
+        bx, by = kernels.bus_points(xs, ys, offsets)
+        return list(zip(bx.tolist(), by.tolist()))
+    
+    def _draw_wire(self, wire_d: List[str], routed: Set[Tuple[int, int, int, int]], x1: int, y1: int, x2: int, y2: int):
+        """Add a wire between two points to the wire path, using orthogonal routing"""
+        # A route and its reverse trace the same segments; emit each one once
+        key = (x1, y1, x2, y2) if (x1, y1) <= (x2, y2) else (x2, y2, x1, y1)
+        if key in routed:
+            return
+        routed.add(key)
+        
+        if y1 == y2:
+            # Direct horizontal line; zero-length wires (port sitting on its
+            # bus point) draw nothing
+            if x1 != x2:
+                wire_d.append(_H_LINE_D(x1, y1, x2))
+        elif x1 == x2:
+            # Direct vertical line
+            wire_d.append(_V_LINE_D(x1, y1, y2))
         else:
-            # L-shaped routing (horizontal first, then vertical)
-            mid_x = (x1 + x2) // 2
-            
-            path = f"M {x1} {y1} L {mid_x} {y1} L {mid_x} {y2} L {x2} {y2}"
-            ET.SubElement(parent, 'path', {
-                'd': path,
-                'class': 'wire'
-            })
-    
-    def _save_svg(self, root: ET.Element, output_file: str):
-        """Save SVG to file with pretty printing"""
-        xml_str = ET.tostring(root, encoding='unicode')
-        
-        # Parse and pretty print
-        try:
-            dom = minidom.parseString(xml_str)
-            pretty_xml = dom.toprettyxml(indent="  ")
-            # Remove extra blank lines
-            lines = [line for line in pretty_xml.split('\n') if line.strip()]
-            # Remove XML declaration (optional)
-            if lines and lines[0].startswith('<?xml'):
-                lines = lines[1:]
-            pretty_xml = '\n'.join(lines)
-        except Exception:
-            pretty_xml = xml_str
-        
-        with open(output_file, 'w', encoding='utf-8') as f:
-            f.write(pretty_xml)
+            # L-shaped routing (horizontal first, then vertical). Port and bus
+            # x coordinates are all even, so the midpoint always lies strictly
+            # between the ends and neither horizontal leg is empty.
+            wire_d.append(_L_ROUTE_D(x1, y1, (x1 + x2) // 2, y2, x2))
 
 
 def main():
     """Main entry point"""
-    if len(sys.argv) < 2:
+    args = sys.argv[1:]
+    sort_components = '--sort-components' in args
+    args = [a for a in args if a != '--sort-components']
+    
+    if not args:
         print("=" * 60)
         print("SPICE to SVG Schematic Generator")
         print("=" * 60)
-        print("\nUsage: python spice_to_svg.py <spice_file> [output_file.svg]")
+        print("\nUsage: python spice_to_svg.py <spice_file> [output_file.svg] [--sort-components]")
         print("\nSupported components:")
         print("  R - Resistor       (R1 node1 node2 value)")
         print("  C - Capacitor      (C1 node1 node2 value)")
@@ -1031,6 +908,7 @@ def main():
         print("\nExample:")
         print("  python spice_to_svg.py circuit.cir")
         print("  python spice_to_svg.py circuit.cir schematic.svg")
+        print("  python spice_to_svg.py circuit.cir --sort-components  # alphabetical layout")
         print("\nExample SPICE file content:")
         print("  Simple RC Filter")
         print("  V1 IN 0 DC 5V")
@@ -1039,11 +917,11 @@ def main():
         print("  .END")
         sys.exit(0)
     
-    spice_file = sys.argv[1]
+    spice_file = args[0]
     
     # Determine output filename
-    if len(sys.argv) > 2:
-        output_file = sys.argv[2]
+    if len(args) > 1:
+        output_file = args[1]
     else:
         # Replace extension with .svg
         if '.' in spice_file:
@@ -1083,7 +961,7 @@ def main():
     print()
     
     # Render schematic
-    renderer = SchematicRenderer(components, connections, parser.title)
+    renderer = SchematicRenderer(components, connections, parser.title, sort_components=sort_components)
     renderer.render(output_file)
     
     print(f"\n{'=' * 60}\n")